@@ -7,6 +7,7 @@ from facebook_business.adobjects.adcreative import AdCreative
 from facebook_business.adobjects.campaign import Campaign
 from facebook_business.adobjects.ad import Ad
 from facebook_business.exceptions import FacebookRequestError
+import base64
 import urllib.parse
 from urllib.parse import urlparse, parse_qs
 import re
@@ -14,10 +15,18 @@ import logging
 import os
 import tempfile
 import subprocess
+import threading
 import time
-from facebook_ads_uploader.image_downloader import download_image_from_url
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from facebook_ads_uploader.image_downloader import (
+    download_image_from_url,
+    is_cached_download,
+)
 from facebook_ads_uploader.video_downloader import download_video_from_url
-from facebook_ads_uploader.video_thumbnail import extract_video_thumbnail
+from facebook_ads_uploader.video_thumbnail import (
+    extract_video_thumbnail,
+    extract_video_thumbnail_bytes,
+)
 
 
 # Configure logging
@@ -76,6 +85,11 @@ EU_COUNTRIES = [
 ]
 
 
+# Concurrency and retry limits for creating the ads of a single campaign
+AD_CREATION_MAX_WORKERS = 8
+AD_CREATION_MAX_RETRIES = 3
+
+
 # Custom exceptions
 class FacebookAPIError(Exception):
     """Base exception for Facebook API errors."""
@@ -730,6 +744,160 @@ def detect_media_type_from_url(url: str) -> str:
     return "image"
 
 
+def fetch_media_file(url: str, media_type: str, download_pool=None) -> str:
+    """
+    Download a media URL to a local file.
+
+    Args:
+        url: The URL to download
+        media_type: The type of media (image or video)
+        download_pool: Optional executor shared by concurrent uploads. The download
+            runs there and this call waits on its future, so the number of
+            simultaneous downloads stays bounded whatever the upload concurrency
+
+    Returns:
+        The path to the local media file
+    """
+    if media_type == "video":
+        download, args = download_video_from_url, (url,)
+    else:
+        download, args = download_image_from_url, (url, media_type)
+
+    if download_pool is None:
+        return download(*args)
+    return download_pool.submit(download, *args).result()
+
+
+def upload_video_thumbnail(
+    ad_account_id: str,
+    video_path: str,
+    cancelled: threading.Event = None,
+):
+    """
+    Extract a thumbnail from a video and upload it as an ad image.
+
+    Meant to run on a worker thread while the video itself uploads. The thumbnail is
+    uploaded from memory through the AdImage bytes field, without a temporary file.
+    Once cancelled is set (the video upload failed) the thumbnail is no longer
+    uploaded, so no orphan image is left in the ad account.
+
+    Returns:
+        The uploaded image hash, or None if no thumbnail could be extracted or
+        uploaded
+    """
+    thumbnail_data = extract_video_thumbnail_bytes(video_path)
+    if not thumbnail_data:
+        logger.warning(
+            "⚠️ No thumbnail extracted from video, creative creation may fail"
+        )
+        return None
+
+    if cancelled is not None and cancelled.is_set():
+        logger.info("⏭️ Video upload failed, skipping the thumbnail upload")
+        return None
+
+    try:
+        # Upload the thumbnail as an image
+        thumbnail_image = AdAccount(ad_account_id).create_ad_image(
+            params={
+                AdImage.Field.bytes: base64.b64encode(thumbnail_data).decode("ascii")
+            }
+        )
+        thumbnail_hash = thumbnail_image[AdImage.Field.hash]
+        logger.info(
+            f"✅ Successfully uploaded video thumbnail with hash: {thumbnail_hash}"
+        )
+        return thumbnail_hash
+    except Exception as e:
+        logger.error(f"❌ Failed to upload video thumbnail: {e}")
+        return None
+
+
+def create_ad_after_delay(ad_account, ad_params: dict, delay: float = 0):
+    """
+    Create a single ad, optionally waiting first.
+
+    The wait happens on the worker thread so a retry backoff never blocks the caller
+    or the creation of unrelated ads.
+    """
+    if delay:
+        time.sleep(delay)
+    return ad_account.create_ad(params=ad_params)
+
+
+def create_ads_concurrently(
+    ad_account,
+    pending_ads: list,
+    max_workers: int = AD_CREATION_MAX_WORKERS,
+    max_retries: int = AD_CREATION_MAX_RETRIES,
+) -> list:
+    """
+    Create ads concurrently and retry only the ones that fail.
+
+    Every ad is submitted up front. A Facebook API failure is resubmitted to the pool
+    with exponential backoff (2s, 4s, ...) while the remaining ads keep going.
+
+    Args:
+        ad_account: The AdAccount to create the ads in
+        pending_ads: List of (layer_index, creative_id, ad_params) tuples
+        max_workers: Maximum number of concurrent create_ad calls
+        max_retries: Maximum number of attempts per ad
+
+    Returns:
+        List of created ad IDs, ordered by layer index
+    """
+    if not pending_ads:
+        return []
+
+    created = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending_ads))) as executor:
+        in_flight = {
+            executor.submit(create_ad_after_delay, ad_account, ad_params): (
+                i,
+                ad_params,
+                1,
+            )
+            for i, _creative_id, ad_params in pending_ads
+        }
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                i, ad_params, attempt = in_flight.pop(future)
+                try:
+                    ad = future.result()
+                    created[i] = ad["id"]
+                    logger.info(
+                        f"✅ Created ad {i+1} with ID {ad['id']} - Facebook Page identity enabled"
+                    )
+                except FacebookRequestError as e:
+                    logger.error(
+                        f"Facebook API error creating ad {i+1}: {e.api_error_message()}"
+                    )
+                    logger.error(f"Full error: {e}")
+
+                    if attempt < max_retries:
+                        # Give FB time to process before retrying, without blocking other ads
+                        delay = 2**attempt
+                        logger.info(
+                            f"Retrying ad {i+1} creation ({attempt}/{max_retries}) in {delay}s..."
+                        )
+                        retry = executor.submit(
+                            create_ad_after_delay, ad_account, ad_params, delay
+                        )
+                        in_flight[retry] = (i, ad_params, attempt + 1)
+                    else:
+                        # Continue with other creatives even if one fails after all retries
+                        logger.error(
+                            f"Failed to create ad {i+1} after {max_retries} attempts"
+                        )
+                except Exception as e:
+                    # Continue with other creatives even if one fails
+                    logger.error(f"Error creating ad {i+1}: {str(e)}")
+
+    return [created[i] for i in sorted(created)]
+
+
 def upload_campaign(
     ad_account_id: str,
     page_id: str,
@@ -737,12 +905,14 @@ def upload_campaign(
     campaign_name: str,
     row_data: dict,
     defaults: dict,
+    download_pool=None,
 ):
     """
     Create a Facebook campaign, ad set, and ad according to the row_data and defaults.
     Returns the created Campaign ID on success, or raises an Exception on failure.
 
-    Now with proper image download and upload for Google Drive URLs.
+    Now with proper image download and upload for Google Drive URLs. Media downloads
+    run on download_pool when one is given (see fetch_media_file).
     """
     # Validate required parameters
     if not ad_account_id:
@@ -921,6 +1091,7 @@ def upload_campaign(
     adset_id = None
     creative_ids = []
     ad_ids = []
+    pending_ads = []  # (layer_index, creative_id, ad_params) waiting for ad creation
     temp_files = []  # Track temporary files to clean up
 
     # Store DSA information for later use with ads
@@ -1131,6 +1302,9 @@ def upload_campaign(
             instagram_page_id = row_data.get("Instagram Page ID") or row_data.get(
                 "instagram page id"
             )
+            # Get the FB_PBIA from environment variables if not provided in row data
+            if not instagram_page_id and fb_pbia:
+                instagram_page_id = fb_pbia
             if not instagram_page_id:
                 # If no Instagram Page ID is provided, use Facebook Page for Instagram content
                 creative_spec["use_page_actor_override"] = True
@@ -1182,12 +1356,9 @@ def upload_campaign(
 
                         # Download the media to a temporary file, specifying the media type
                         logger.info(f"🔽 Downloading {media_type} from Google Drive...")
-                        if media_type == "video":
-                            temp_file_path = download_video_from_url(converted_url)
-                        else:
-                            temp_file_path = download_image_from_url(
-                                converted_url, media_type
-                            )
+                        temp_file_path = fetch_media_file(
+                            converted_url, media_type, download_pool
+                        )
                         temp_files.append(temp_file_path)  # Track for cleanup
                         logger.info(f"✅ Download completed: {temp_file_path}")
 
@@ -1365,7 +1536,9 @@ def upload_campaign(
                         # For videos, we need to download and upload
                         logger.info(f"🎬 Processing direct URL as video: {media_url}")
                         try:
-                            temp_file_path = download_video_from_url(media_url)
+                            temp_file_path = fetch_media_file(
+                                media_url, media_type, download_pool
+                            )
                             temp_files.append(temp_file_path)
 
                             # Verify the file exists and has content
@@ -1377,37 +1550,29 @@ def upload_campaign(
                                     f"Downloaded video file is empty or does not exist: {temp_file_path}"
                                 )
 
-                            video = AdVideo(parent_id=ad_account_id)
-                            video[AdVideo.Field.filepath] = temp_file_path
-                            video.remote_create()
-                            video_id = video[AdVideo.Field.id]
-
-                            # Extract thumbnail from the video
-                            thumbnail_path = extract_video_thumbnail(temp_file_path)
-                            thumbnail_hash = None
+                            # Extract and upload the thumbnail on a worker thread
+                            # while the video uploads, instead of after it
+                            video_failed = threading.Event()
+                            with ThreadPoolExecutor(max_workers=1) as executor:
+                                thumbnail_future = executor.submit(
+                                    upload_video_thumbnail,
+                                    ad_account_id,
+                                    temp_file_path,
+                                    video_failed,
+                                )
 
-                            if thumbnail_path:
+                                video = AdVideo(parent_id=ad_account_id)
+                                video[AdVideo.Field.filepath] = temp_file_path
                                 try:
-                                    # Upload the thumbnail as an image
-                                    thumbnail_image = AdImage(parent_id=ad_account_id)
-                                    thumbnail_image[AdImage.Field.filename] = (
-                                        thumbnail_path
-                                    )
-                                    thumbnail_image.remote_create()
-                                    thumbnail_hash = thumbnail_image[AdImage.Field.hash]
-                                    logger.info(
-                                        f"✅ Successfully uploaded video thumbnail with hash: {thumbnail_hash}"
-                                    )
-                                    # Add the thumbnail path to temp_files for cleanup
-                                    temp_files.append(thumbnail_path)
-                                except Exception as e:
-                                    logger.error(
-                                        f"❌ Failed to upload video thumbnail: {e}"
-                                    )
-                            else:
-                                logger.warning(
-                                    "⚠️ No thumbnail extracted from video, creative creation may fail"
-                                )
+                                    video.remote_create()
+                                except Exception:
+                                    # Leaving the with block still waits for the
+                                    # worker, which must not upload a thumbnail
+                                    video_failed.set()
+                                    raise
+                                video_id = video[AdVideo.Field.id]
+
+                                thumbnail_hash = thumbnail_future.result()
 
                             logger.info(
                                 f"✅ Successfully uploaded video with ID: {video_id}"
@@ -1585,8 +1750,8 @@ def upload_campaign(
                             logger.info(
                                 f"🖼️ Complex URL detected, downloading from: {media_url}"
                             )
-                            temp_file_path = download_image_from_url(
-                                media_url, media_type
+                            temp_file_path = fetch_media_file(
+                                media_url, media_type, download_pool
                             )
                             temp_files.append(temp_file_path)
 
@@ -1858,47 +2023,8 @@ def upload_campaign(
                     if dsa_payor:
                         ad_params["dsa_payor"] = dsa_payor
 
-                # Create the ad with retries (sometimes FB can be flaky)
-                max_retries = 3
-                retry_count = 0
-                ad_created = False
-
-                while retry_count < max_retries and not ad_created:
-                    try:
-                        # Create ad with full error trace
-                        ad = ad_account.create_ad(params=ad_params)
-                        ad_id = ad["id"]
-                        ad_ids.append(ad_id)
-                        logger.info(
-                            f"✅ Created ad {i+1} with ID {ad_id} - Facebook Page identity enabled"
-                        )
-                        ad_created = True
-                    except FacebookRequestError as e:
-                        error_msg = f"Facebook API error creating ad {i+1}: {e.api_error_message()}"
-                        logger.error(error_msg)
-                        logger.error(f"Full error: {e}")
-
-                        # Increment retry counter
-                        retry_count += 1
-
-                        if retry_count < max_retries:
-                            logger.info(
-                                f"Retrying ad creation ({retry_count}/{max_retries})..."
-                            )
-                            # Wait a bit before retrying (give FB time to process)
-                            import time
-
-                            time.sleep(2)
-                        else:
-                            logger.error(
-                                f"Failed to create ad after {max_retries} attempts"
-                            )
-                            # Continue with other creatives even if one fails after all retries
-                            break
-                    except Exception as e:
-                        logger.error(f"Error creating ad {i+1}: {str(e)}")
-                        # Continue with other creatives even if one fails
-                        break
+                # Queue the ad; all ads are created concurrently once every creative exists
+                pending_ads.append((i, creative_id, ad_params))
 
             except FacebookRequestError as e:
                 logger.error(
@@ -1913,6 +2039,9 @@ def upload_campaign(
                 # Continue with other creatives even if one fails
                 continue
 
+        # 4. Create all queued ads concurrently, retrying only the ones that fail
+        ad_ids.extend(create_ads_concurrently(ad_account, pending_ads))
+
         # Return campaign ID if at least one ad was created successfully
         if ad_ids:
             return campaign_id
@@ -1949,19 +2078,19 @@ def upload_campaign(
         except Exception as cleanup_error:
             logger.error(f"Error during cleanup: {cleanup_error}")
 
-        # Always clean up temporary files
-        finally:
-            for temp_file in temp_files:
-                try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                        logger.info(f"Removed temporary file: {temp_file}")
-                except Exception as file_cleanup_error:
-                    logger.error(f"Error removing temporary file: {file_cleanup_error}")
-
         # Re-raise the original exception
         raise
 
-    except Exception as e:
-        logger.error(f"❌ Error creating placeholder thumbnail: {e}")
-        return None
+    finally:
+        # Always clean up temporary files, on success as well as failure. Cached
+        # image downloads may be shared with other rows and are removed by
+        # image_downloader once the run is over.
+        for temp_file in temp_files:
+            if is_cached_download(temp_file):
+                continue
+            try:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+                    logger.info(f"Removed temporary file: {temp_file}")
+            except Exception as file_cleanup_error:
+                logger.error(f"Error removing temporary file: {file_cleanup_error}")
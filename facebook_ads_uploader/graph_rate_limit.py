@@ -0,0 +1,108 @@
+"""
+Client-side pacing for Facebook Graph API calls.
+
+Calls go through a token bucket so bursts stay under the Graph API rate limits
+instead of running into (#613) "Calls to this api have exceeded the rate limit"
+errors, and the usage headers Facebook returns are checked so callers pause
+before the limit is reached.
+"""
+
+import json
+import logging
+import time
+
+from facebook_ads_uploader.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Graph API calls allowed per hour, and the bucket size for bursts
+GRAPH_CALLS_PER_HOUR = 200
+
+# Pause once any usage metric in the usage headers reaches this percentage
+USAGE_PAUSE_THRESHOLD = 90
+USAGE_PAUSE_SECONDS = 60
+
+# Error codes Facebook uses for rate limiting
+RATE_LIMIT_ERROR_CODES = frozenset({4, 17, 32, 613, 80004})
+
+# Response headers reporting app / business use case usage
+USAGE_HEADERS = ("x-app-usage", "x-business-use-case-usage", "x-ad-account-usage")
+
+
+GRAPH_LIMITER = TokenBucket(GRAPH_CALLS_PER_HOUR, 3600)
+
+
+def is_rate_limit_error(error) -> bool:
+    """Return True if error is a Graph API rate limiting error (e.g. #613)."""
+    api_error_code = getattr(error, "api_error_code", None)
+    if not callable(api_error_code):
+        return False
+    return api_error_code() in RATE_LIMIT_ERROR_CODES
+
+
+def max_usage_percent(headers) -> int:
+    """
+    Return the highest usage percentage reported in Graph API response headers.
+
+    X-App-Usage holds {"call_count": .., "total_time": .., "total_cputime": ..};
+    X-Business-Use-Case-Usage maps business IDs to lists of such dicts.
+    """
+    highest = 0
+    for name, value in (headers or {}).items():
+        if name.lower() not in USAGE_HEADERS:
+            continue
+        try:
+            usage = json.loads(value)
+        except (TypeError, ValueError):
+            continue
+        entries = [usage]
+        if isinstance(usage, dict) and not any(
+            key in usage for key in ("call_count", "total_time", "total_cputime")
+        ):
+            entries = [
+                entry
+                for per_id in usage.values()
+                for entry in (per_id if isinstance(per_id, list) else [per_id])
+            ]
+        for entry in entries:
+            if isinstance(entry, dict):
+                for key in ("call_count", "total_time", "total_cputime"):
+                    metric = entry.get(key)
+                    if isinstance(metric, (int, float)):
+                        highest = max(highest, metric)
+    return highest
+
+
+def check_usage_headers(headers):
+    """Sleep for USAGE_PAUSE_SECONDS if the usage headers are near the limit."""
+    usage = max_usage_percent(headers)
+    if usage >= USAGE_PAUSE_THRESHOLD:
+        logger.warning(
+            "⏳ Graph API usage at %s%%, pausing %ss", usage, USAGE_PAUSE_SECONDS
+        )
+        time.sleep(USAGE_PAUSE_SECONDS)
+
+
+def rate_limited_call(func, *args, max_retries=2, **kwargs):
+    """
+    Call a Graph API function through GRAPH_LIMITER.
+
+    Rate limiting errors are retried after USAGE_PAUSE_SECONDS, up to
+    max_retries times; other errors are raised immediately.
+    """
+    attempt = 0
+    while True:
+        GRAPH_LIMITER.acquire()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_rate_limit_error(e):
+                raise
+            attempt += 1
+            logger.warning(
+                "⏳ Graph API rate limit hit, retrying in %ss (attempt %s/%s)",
+                USAGE_PAUSE_SECONDS,
+                attempt,
+                max_retries,
+            )
+            time.sleep(USAGE_PAUSE_SECONDS)
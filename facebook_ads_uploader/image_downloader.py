@@ -1,21 +1,113 @@
 # In facebook_ads_uploader/image_downloader.py
+import atexit
 import tempfile
 import os
+import random
 import requests
 import logging
 import re
 import hashlib
+import shutil
+import threading
 import time
 from urllib.parse import urlparse, parse_qs, unquote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Streaming chunk sizes: larger chunks mean fewer Python-level iterations and write() calls
+IMAGE_CHUNK_SIZE = 128 * 1024  # 128 KiB
+VIDEO_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Bodies up to this size with a known Content-Length are read into a single buffer
+MAX_PREALLOCATED_SIZE = 16 * 1024 * 1024  # 16 MiB
+
+# Content-Type prefixes accepted for each media type
+ACCEPTED_CONTENT_TYPES = {
+    "image": ("image/", "application/octet-stream", "binary/octet-stream"),
+    "video": ("video/", "application/octet-stream", "binary/octet-stream"),
+}
+
+
+class _PermanentDownloadError(RuntimeError):
+    """Download failure that retrying would not fix."""
+
+    pass
+
+
+# Numeric asset ID in Facebook CDN paths, e.g. /123456789_...
+_FB_ID_RE = re.compile(r"/(\d+)_")
+
+# Shared session so repeated downloads from the same CDN reuse pooled keep-alive
+# connections instead of paying a TCP/TLS handshake per file. The adapter retries
+# throttling and transient gateway errors (honouring Retry-After); the loop in
+# download_image_from_url still handles timeouts and broken streams.
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+        "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
+    }
+)
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=True,
+    ),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# Rows often reuse the same creative, so downloads are memoized per (url, media_type)
+# for the lifetime of the process. Cached files are removed at exit.
+_DOWNLOAD_CACHE = {}
+_DOWNLOAD_LOCKS = {}
+_DOWNLOAD_LOCKS_GUARD = threading.Lock()
+_DOWNLOADED_PATHS = set()
+
+
+def is_cached_download(path: str) -> bool:
+    """Return True if path is a cached download that other callers may reuse."""
+    return path in _DOWNLOADED_PATHS
+
+
+def cleanup_downloads(paths=None) -> None:
+    """
+    Remove downloaded temporary files.
+
+    Args:
+        paths: Files to remove. Defaults to every cached download of this module.
+    """
+    if paths is None:
+        paths = list(_DOWNLOADED_PATHS)
+
+    for path in paths:
+        _DOWNLOADED_PATHS.discard(path)
+        try:
+            os.remove(path)
+            logger.debug(f"Removed temporary file: {path}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove temporary file {path}: {e}")
+
+
+atexit.register(cleanup_downloads)
+
 
 def download_image_from_url(url: str, media_type: str = "image") -> str:
     """
     Download an image or video from a URL and save it to a temporary file.
     Handles complex URLs including Facebook CDN and Google Drive links.
 
+    Repeated calls for the same URL return the already downloaded file as long as
+    it still exists.
+
     Args:
         url: The URL of the media to download
         media_type: The type of media (image or video)
@@ -26,22 +118,39 @@ def download_image_from_url(url: str, media_type: str = "image") -> str:
     Raises:
         RuntimeError: If the media cannot be downloaded
     """
+    key = (url, media_type)
+    with _DOWNLOAD_LOCKS_GUARD:
+        url_lock = _DOWNLOAD_LOCKS.setdefault(key, threading.Lock())
+
+    # One download per URL at a time; concurrent callers wait and share the result
+    with url_lock:
+        cached_path = _DOWNLOAD_CACHE.get(key)
+        if cached_path and os.path.exists(cached_path):
+            logger.info(f"♻️ Reusing downloaded {media_type} for URL: {url}")
+            return cached_path
+
+        temp_path = _download_to_temp_file(url, media_type)
+        _DOWNLOAD_CACHE[key] = temp_path
+        _DOWNLOADED_PATHS.add(temp_path)
+        return temp_path
+
+
+def _download_to_temp_file(url: str, media_type: str) -> str:
+    """Download url into a new temporary file; see download_image_from_url."""
     logger.info(f"🔽 Downloading {media_type} from URL: {url}")
 
     # Clean the URL if it contains query parameters with special characters
     cleaned_url = url
 
     # Generate a filename based on the URL
-    parsed_url = urlparse(url)
-
     # For Facebook CDN URLs with complex parameters, create a filename from hash of URL
     if "fbcdn.net" in url or len(url) > 200:
         # Extract any identifiable number from the URL
-        id_match = re.search(r"\/(\d+)_", url)
+        id_match = _FB_ID_RE.search(url)
         id_part = (
             f"fb_{id_match.group(1)}"
             if id_match
-            else f"fb_{hashlib.md5(url.encode()).hexdigest()[:8]}"
+            else f"fb_{hashlib.blake2b(url.encode(), digest_size=4).hexdigest()}"
         )
 
         # Set appropriate extension
@@ -50,8 +159,8 @@ def download_image_from_url(url: str, media_type: str = "image") -> str:
         else:
             filename = f"{id_part}.jpg"
     else:
-        # For normal URLs, get filename from path
-        filename = os.path.basename(parsed_url.path)
+        # For normal URLs, get filename from path (only these need a full parse)
+        filename = os.path.basename(urlparse(url).path)
         # Handle empty filenames or missing extensions
         if not filename or "." not in filename:
             # Default to appropriate extension based on media_type
@@ -66,6 +175,13 @@ def download_image_from_url(url: str, media_type: str = "image") -> str:
         suffix = ".mp4" if media_type.lower() == "video" else ".jpg"
 
     fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    # Reopened by path on each attempt so a retry never writes to a closed fd
+    os.close(fd)
+
+    # Videos are typically many MB, so stream them in larger chunks
+    chunk_size = (
+        VIDEO_CHUNK_SIZE if media_type.lower() == "video" else IMAGE_CHUNK_SIZE
+    )
 
     # Setting up improved timeouts and retry handling
     max_retries = 3
@@ -75,27 +191,59 @@ def download_image_from_url(url: str, media_type: str = "image") -> str:
 
     # Try multiple times with increasing timeout
     while retry_count < max_retries and not download_success:
+        response = None
         try:
             timeout = 30 + (retry_count * 15)  # Increase timeout with each retry
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                "Accept": "image/webp,image/apng,image/*,*/*;q=0.8",
-            }
             logger.info(
                 f"Download attempt {retry_count + 1}/{max_retries} (timeout: {timeout}s)"
             )
 
             # Download the image with proper headers for Facebook CDN
-            response = requests.get(url, stream=True, timeout=timeout, headers=headers)
+            response = _SESSION.get(url, stream=True, timeout=timeout)
             response.raise_for_status()  # Raise an exception for HTTP errors
 
-            # Write the image to the temp file
-            total_size = 0
-            with os.fdopen(fd, "wb") as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        temp_file.write(chunk)
-                        total_size += len(chunk)
+            # CDNs sometimes answer 200 with an HTML error page; catch it here
+            # instead of failing later in the Facebook upload
+            content_type = response.headers.get("Content-Type", "").lower()
+            accepted_types = ACCEPTED_CONTENT_TYPES.get(
+                media_type.lower(), ACCEPTED_CONTENT_TYPES["image"]
+            )
+            if content_type and not content_type.startswith(accepted_types):
+                raise _PermanentDownloadError(
+                    f"Unexpected content type: {content_type}"
+                )
+
+            content_length = int(response.headers.get("Content-Length") or 0)
+            if (
+                0 < content_length <= MAX_PREALLOCATED_SIZE
+                and not response.headers.get("Content-Encoding")
+            ):
+                # Known, unencoded size: read straight into one preallocated buffer
+                # and write it out in a single call
+                buffer = bytearray(content_length)
+                view = memoryview(buffer)
+                total_size = 0
+                while total_size < content_length:
+                    read = response.raw.readinto(view[total_size:])
+                    if not read:
+                        break
+                    total_size += read
+                if total_size != content_length:
+                    raise RuntimeError(
+                        f"Incomplete download: got {total_size} of {content_length} bytes"
+                    )
+                # Unbuffered: the whole body goes to the OS without an extra copy
+                with open(temp_path, "wb", buffering=0) as temp_file:
+                    written = 0
+                    while written < total_size:
+                        written += temp_file.write(view[written:])
+            else:
+                # Stream the body straight into the temp file; copyfileobj runs the
+                # read/write loop without a Python callback per chunk
+                response.raw.decode_content = True
+                with open(temp_path, "wb") as temp_file:
+                    shutil.copyfileobj(response.raw, temp_file, length=chunk_size)
+                    total_size = temp_file.tell()
 
             # Verify we got actual content
             if total_size == 0:
@@ -108,18 +256,31 @@ def download_image_from_url(url: str, media_type: str = "image") -> str:
             return temp_path
 
         except Exception as e:
+            # Release the connection of a response that wasn't read to the end
+            if response is not None:
+                response.close()
             last_error = str(e)
             logger.warning(f"Download attempt {retry_count + 1} failed: {last_error}")
             retry_count += 1
 
-            # Wait before retrying
+            # The server would send the same content again, so don't retry
+            if isinstance(e, _PermanentDownloadError):
+                break
+
+            # Exponential backoff with jitter so parallel downloads don't retry in lockstep
             if retry_count < max_retries:
-                time.sleep(2)
+                time.sleep(min(30, 2**retry_count) + random.uniform(0, 0.5))
+
+    # If we got here, all attempts failed; don't leave a partial file behind
+    try:
+        os.remove(temp_path)
+    except OSError:
+        pass
 
-    # If we got here, all attempts failed
     logger.error(
-        f"❌ Failed to download media from URL {url} after {max_retries} attempts: {last_error}"
+        f"❌ Failed to download media from URL {url} after {retry_count} attempts: {last_error}"
     )
     raise RuntimeError(
-        f"Failed to download media after {max_retries} attempts: {last_error}"
+        f"Failed to download media after {retry_count} attempts: {last_error}"
     )
+
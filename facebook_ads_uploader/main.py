@@ -1,3 +1,5 @@
+import os
+import string
 import sys
 import argparse
 import traceback
@@ -7,6 +9,7 @@ from datetime import datetime
 from facebook_ads_uploader import config as config_module
 from facebook_ads_uploader import sheet as sheet_module
 from facebook_ads_uploader import facebook_api
+from facebook_ads_uploader import image_downloader
 from facebook_ads_uploader import twilio_notifier
 
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -19,6 +22,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger("facebook_ads_uploader")
 
+# Version letters for campaigns sharing the same topic and country (A, B, C, ...)
+VERSION_LETTERS = string.ascii_uppercase
+
+# Concurrent media downloads shared by all uploads (I/O bound, so threads work well)
+DOWNLOAD_MAX_WORKERS = 8
+
+
+def normalize_record_keys(record: dict) -> dict:
+    """Return a view of a sheet record with lower-cased column names for single lookups."""
+    return {str(key).lower(): value for key, value in record.items()}
+
+
+def upload_task(
+    task: tuple, config: dict, debug: bool = False, download_pool=None
+) -> tuple:
+    """
+    Upload the campaign for one task and report the outcome.
+
+    Args:
+        task: Upload task tuple as built in run()
+        config: Loaded defaults configuration
+        debug: Print tracebacks for failed uploads
+        download_pool: Executor shared by all tasks for media downloads
+
+    Returns:
+        (row_idx, status, message) where status is "SUCCESS" or "FAILED"
+    """
+    (
+        row_idx,
+        campaign_name,
+        record,
+        ad_account_id,
+        page_id,
+        pixel_id,
+        platform,
+        error_msg,
+    ) = task
+    if error_msg:  # This row had a pre-execution error
+        logger.error(f"[FAILED] Row {row_idx} (Platform: {platform}) -> {error_msg}")
+        return (row_idx, "FAILED", error_msg)
+
+    try:
+        campaign_id = facebook_api.upload_campaign(
+            ad_account_id,
+            page_id,
+            pixel_id,
+            campaign_name,
+            record,
+            config,
+            download_pool=download_pool,
+        )
+        logger.info(f"[SUCCESS] {campaign_name} (Row {row_idx}, Platform: {platform})")
+        return (row_idx, "SUCCESS", f"Campaign ID: {campaign_id}")
+    except Exception as exc:
+        err_msg = str(exc)
+        logger.error(
+            f"[FAILED] {campaign_name} (Row {row_idx}, Platform: {platform}) -> {err_msg}"
+        )
+        if debug:
+            traceback.print_exc()
+        return (row_idx, "FAILED", err_msg)
+
 
 def run():
     # Parse command-line arguments
@@ -138,19 +203,22 @@ def run():
     # Filter rows where 'upload' is 'yes' and 'platform' is one of our supported platforms
     filtered_rows = []
     skipped_rows_count = 0
+    # Match platform names case-insensitively, mapping back to the configured name
+    platforms_by_lower = {name.lower(): name for name in platforms}
 
     for row_idx, record in rows_to_process:
-        upload_value = (
-            str(record.get("Upload") or record.get("upload") or "").strip().lower()
+        # Normalize column names once and reuse the view for grouping and task prep
+        norm = normalize_record_keys(record)
+        upload_value = str(norm.get("upload") or "").strip().lower()
+        if upload_value != "yes":
+            skipped_rows_count += 1
+            continue
+
+        platform_value = platforms_by_lower.get(
+            str(norm.get("platform") or "").strip().lower()
         )
-        # Get platform value while preserving original case
-        platform_value = str(
-            record.get("Platform") or record.get("platform") or ""
-        ).strip()
-
-        # Check if the platform exists in the platforms dictionary
-        if upload_value == "yes" and platform_value in platforms:
-            filtered_rows.append((row_idx, record))
+        if platform_value:
+            filtered_rows.append((row_idx, record, norm, platform_value))
             logger.debug(
                 f"Added row {row_idx} for processing (platform: {platform_value})"
             )
@@ -201,18 +269,21 @@ def run():
 
     # Ensure Status and Error columns exist
     status_col_index, error_col_index = sheet_module.ensure_status_columns(worksheet)
+    # Status/Error values already in the sheet, so unchanged cells aren't rewritten
+    current_status_values = {
+        row_idx: (norm.get("status"), norm.get("error"))
+        for row_idx, record, norm, platform_value in rows_to_process
+    }
 
     # Group rows by platform
     rows_by_platform = {}
-    for row_idx, record in rows_to_process:
-        platform_value = str(
-            record.get("Platform") or record.get("platform") or ""
-        ).strip()
+    for row_idx, record, norm, platform_value in rows_to_process:
         if platform_value not in rows_by_platform:
             rows_by_platform[platform_value] = []
-        rows_by_platform[platform_value].append((row_idx, record))
+        rows_by_platform[platform_value].append((row_idx, record, norm))
 
     # Process each platform and prepare upload tasks
+    display_dot = display_date.replace("-", ".")  # date part of campaign names
     tasks = []
     for platform, platform_rows in rows_by_platform.items():
         platform_config = platforms.get(platform, {})
@@ -232,7 +303,7 @@ def run():
                 f"Failed to initialize Facebook API for platform '{platform}': {e}"
             )
             # Mark all rows for this platform as failed
-            for row_idx, record in platform_rows:
+            for row_idx, _record, _norm in platform_rows:
                 tasks.append(
                     (
                         row_idx,
@@ -256,7 +327,7 @@ def run():
             error_msg = f"Missing required credentials for platform '{platform}'"
             logger.error(error_msg)
             # Mark all rows for this platform as failed
-            for row_idx, record in platform_rows:
+            for row_idx, _record, _norm in platform_rows:
                 tasks.append(
                     (
                         row_idx,
@@ -276,21 +347,36 @@ def run():
         counters = (
             {}
         )  # track counts for (topic, country_code) to assign version letters
-        for row_idx, record in platform_rows:
-            topic = str(record.get("Topic") or record.get("topic") or "").strip()
+        for row_idx, record, norm in platform_rows:
+            topic = str(norm.get("topic") or "").strip()
 
             # First check if Country_code is provided directly
-            country_code = record.get("Country_code") or record.get("country_code")
+            country_code = norm.get("country_code")
             if not country_code:
                 # Fall back to normalizing the country name
-                country_val = record.get("Country") or record.get("country") or ""
+                country_val = norm.get("country") or ""
                 country_code = facebook_api.normalize_country_code(country_val)
 
             key = (topic, country_code)
             counters[key] = counters.get(key, 0) + 1
-            version_letter = chr(ord("A") + counters[key] - 1)
-            hash_id = str(record.get("Hash ID") or record.get("hash id") or "")
-            campaign_name = f"{platform}_{topic}_{country_code}_Agent_{version_letter}_{display_date.replace('-', '.')}_{hash_id}"
+            version_index = counters[key] - 1
+            version_letter = (
+                VERSION_LETTERS[version_index]
+                if version_index < len(VERSION_LETTERS)
+                else chr(ord("A") + version_index)
+            )
+            hash_id = str(norm.get("hash id") or "")
+            campaign_name = "_".join(
+                (
+                    platform,
+                    topic,
+                    str(country_code),
+                    "Agent",
+                    version_letter,
+                    display_dot,
+                    hash_id,
+                )
+            )
 
             logger.debug(
                 f"Prepared campaign '{campaign_name}' (Row {row_idx}) for upload with platform '{platform}'"
@@ -308,63 +394,53 @@ def run():
                 )
             )
 
-    # Upload campaigns with up to 3 concurrent workers
+    # Upload campaigns concurrently. Uploads are network-bound, so size the pool from
+    # the task count, capped by FB_UPLOAD_CONCURRENCY / upload.max_workers (default 8)
+    max_upload_workers = os.environ.get("FB_UPLOAD_CONCURRENCY") or config.get(
+        "upload", {}
+    ).get("max_workers", 8)
+    try:
+        max_upload_workers = int(max_upload_workers)
+    except (TypeError, ValueError):
+        logger.warning(
+            f"Invalid upload concurrency '{max_upload_workers}', using default of 8"
+        )
+        max_upload_workers = 8
+    max_upload_workers = max(1, min(len(tasks), max_upload_workers))
+    logger.debug(f"Uploading with {max_upload_workers} concurrent workers")
+
+    # Status results are written to the sheet in the background as uploads finish
+    status_updater = sheet_module.AsyncStatusUpdater(
+        worksheet,
+        status_col_index,
+        error_col_index,
+        current_values=current_status_values,
+    )
     results = []
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        future_to_task = {}
-        for (
-            row_idx,
-            campaign_name,
-            record,
-            ad_account_id,
-            page_id,
-            pixel_id,
-            platform,
-            error_msg,
-        ) in tasks:
-            if error_msg:  # This row had a pre-execution error
-                results.append((row_idx, "FAILED", error_msg))
-                logger.error(
-                    f"[FAILED] Row {row_idx} (Platform: {platform}) -> {error_msg}"
-                )
-                continue
-
-            future = executor.submit(
-                facebook_api.upload_campaign,
-                ad_account_id,
-                page_id,
-                pixel_id,
-                campaign_name,
-                record,
-                config,
-            )
-            future_to_task[future] = (row_idx, campaign_name, platform)
-
-        for future in as_completed(future_to_task):
-            row_idx, campaign_name, platform = future_to_task[future]
-            try:
-                campaign_id = future.result()  # raises exception if the upload failed
-                results.append((row_idx, "SUCCESS", f"Campaign ID: {campaign_id}"))
-                logger.info(
-                    f"[SUCCESS] {campaign_name} (Row {row_idx}, Platform: {platform})"
-                )
-            except Exception as exc:
-                err_msg = str(exc)
-                results.append((row_idx, "FAILED", err_msg))
-                logger.error(
-                    f"[FAILED] {campaign_name} (Row {row_idx}, Platform: {platform}) -> {err_msg}"
-                )
-                if debug:
-                    traceback.print_exc()
-
-    # Sort results by row index (to update in order)
+    # Media downloads run on their own pool as each upload needs them, so one task's
+    # downloads overlap the other tasks' uploads
+    with ThreadPoolExecutor(
+        max_workers=DOWNLOAD_MAX_WORKERS
+    ) as download_pool, ThreadPoolExecutor(max_workers=max_upload_workers) as executor:
+        futures = [
+            executor.submit(upload_task, task, config, debug, download_pool)
+            for task in tasks
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            status_updater.submit(result)
+
+    # Cached image downloads can be shared between rows, so remove them only now
+    image_downloader.cleanup_downloads()
+
+    # Results arrive in completion order; sort them by row index so the SMS summary
+    # lists errors in sheet order
     results.sort(key=lambda x: x[0])
 
-    # Update the Google Sheet with status results
+    # Wait for the remaining status and error results to be written
     try:
-        sheet_module.update_status_rows(
-            worksheet, status_col_index, error_col_index, results
-        )
+        status_updater.close()
         logger.info("Spreadsheet updated with status and error information.")
     except Exception as e:
         logger.error(f"Error updating spreadsheet statuses: {e}")
@@ -373,17 +449,25 @@ def run():
 
     # Compose SMS summary
     total = len(results)
-    success_count = sum(1 for _, status, _ in results if status == "SUCCESS")
-    fail_count = sum(1 for _, status, _ in results if status == "FAILED")
+    success_count = 0
+    fail_count = 0
+    error_texts = []
+    error_summary_len = 0  # length of " | ".join(error_texts)
+    for _, status, error in results:
+        if status == "SUCCESS":
+            success_count += 1
+        elif status == "FAILED":
+            fail_count += 1
+            # Stop collecting once the summary is over its 300-char limit
+            if error_summary_len > 300:
+                continue
+            err = error or ""
+            if len(err) > 100:
+                err = err[:97] + "..."
+            error_summary_len += len(err) + (3 if error_texts else 0)
+            error_texts.append(err)
     sms_message = f"FB Ads upload complete: {success_count} succeeded, {fail_count} failed out of {total}."
     if fail_count > 0:
-        error_texts = []
-        for _, status, error in results:
-            if status == "FAILED":
-                err = error or ""
-                if len(err) > 100:
-                    err = err[:97] + "..."
-                error_texts.append(err)
         if error_texts:
             error_summary = " | ".join(error_texts)
             if len(error_summary) > 300:
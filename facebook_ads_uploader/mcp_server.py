@@ -1,9 +1,11 @@
 import json
 import os
 import logging
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import socket
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from typing import Dict, Any, Optional, List
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
 import inspect
 import traceback
@@ -19,33 +21,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp_server")
 
+# orjson is much faster than the stdlib json module and returns bytes directly
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(data) -> bytes:
+    """Serialize data to JSON bytes for a response body."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode()
+
+
+def loads_json(body: bytes):
+    """Parse a JSON request body. Raises ValueError on invalid JSON."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(bytes(body))
+
+
+def build_tool_schema(func) -> dict:
+    """Precompute the parameter names a tool function requires and accepts."""
+    params = inspect.signature(func).parameters.values()
+    return {
+        "required": tuple(
+            param.name
+            for param in params
+            if param.default is inspect.Parameter.empty
+            and param.kind
+            not in (inspect.Parameter.VAR_KEYWORD, inspect.Parameter.VAR_POSITIONAL)
+        ),
+        "accepted": frozenset(param.name for param in params),
+    }
+
+
+# Tool calls run on a dedicated, bounded pool instead of directly on the unbounded
+# per-connection threads, capping how many uploads run at once
+TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("FB_UPLOADER_POOL", 64)),
+    thread_name_prefix="fb-tool",
+)
+
+# Headers shared by every response
+RESPONSE_HEADERS = (
+    b"Content-Type: application/json\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"Access-Control-Allow-Methods: POST, OPTIONS\r\n"
+    b"Access-Control-Allow-Headers: Content-Type\r\n"
+)
+
+# Invariant response bodies, serialized once
+HEALTH_OK_BODY = dumps_json({"status": "ok", "message": "MCP server is running"})
+NOT_FOUND_BODY = dumps_json({"error": "Not found"})
+EMPTY_BODY_ERROR_BODY = dumps_json({"error": "Empty request body"})
+INVALID_JSON_BODY = dumps_json({"error": "Invalid JSON"})
+BODY_TOO_LARGE_BODY = dumps_json({"error": "Request body too large"})
+INVALID_LENGTH_BODY = dumps_json({"error": "Invalid Content-Length"})
+
+# /v1/messages always answers with the same notice, so it is serialized once
+MESSAGES_NOTICE_BODY = dumps_json(
+    {
+        "id": "msg_01234567890123456789012345",
+        "type": "message",
+        "role": "assistant",
+        "content": [
+            {
+                "type": "text",
+                "text": "This Model Context Protocol (MCP) server is configured for tool invocation only, not direct messaging. Please use the appropriate endpoints to interact with the Facebook Ads Uploader tool.",
+            }
+        ],
+        "model": "facebook-ads-uploader-tool",
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 0, "output_tokens": 0},
+    }
+)
+
+# Tool name -> function dispatch table
+TOOL_FUNCTIONS = {
+    "create_maximizer_campaign": create_maximizer_campaign,
+    "ping": ping,
+}
+
+# Parameter schemas per tool, built once instead of inspecting on every request
+TOOL_SCHEMAS = {name: build_tool_schema(func) for name, func in TOOL_FUNCTIONS.items()}
+
 
 class MCPHandler(BaseHTTPRequestHandler):
     """HTTP request handler for the Model Context Protocol (MCP)"""
 
-    def _set_headers(self, content_type="application/json"):
-        self.send_response(200)
-        self.send_header("Content-Type", content_type)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+    # HTTP/1.1 keeps connections alive between requests, so every response must
+    # carry a Content-Length
+    protocol_version = "HTTP/1.1"
+
+    # Largest request body accepted; bigger ones are rejected before reading
+    MAX_BODY = 1 << 20
+
+    def log_message(self, format, *args):
+        # BaseHTTPRequestHandler formats and writes an access line to stderr on
+        # every request; route it through logging so it's skipped unless enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{self.address_string()} - {format % args}")
+
+    def log_error(self, format, *args):
+        logger.warning(f"{self.address_string()} - {format % args}")
+
+    def _write_response(self, status=200, body=b""):
+        """Write the status line, headers and body with a single socket write.
+
+        send_response()/send_header()/end_headers() flush the headers and the
+        body as separate writes, i.e. separate small TCP packets.
+        """
+        self.log_request(status)
+        buf = bytearray(
+            b"%s %d %s\r\n"
+            % (
+                self.protocol_version.encode(),
+                status,
+                self.responses.get(status, ("",))[0].encode(),
+            )
+        )
+        buf += b"Server: %s\r\nDate: %s\r\n" % (
+            self.version_string().encode(),
+            self.date_time_string().encode(),
+        )
+        buf += RESPONSE_HEADERS
+        buf += b"Content-Length: %d\r\nConnection: %s\r\n\r\n" % (
+            len(body),
+            b"close" if self.close_connection else b"keep-alive",
+        )
+        buf += body
+        self.wfile.write(buf)
+
+    def _send_json(self, response, status=200):
+        """Send a JSON response with its Content-Length."""
+        self._write_response(status, dumps_json(response))
 
     def do_OPTIONS(self):
         """Handle preflight CORS requests"""
-        self._set_headers()
+        self._write_response()
 
     def do_GET(self):
         """Handle GET requests - used for health checks"""
         if self.path == "/health" or self.path == "/":
-            self._set_headers()
-            response = {"status": "ok", "message": "MCP server is running"}
-            self.wfile.write(json.dumps(response).encode())
+            self._write_response(200, HEALTH_OK_BODY)
         else:
-            self.send_response(404)
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+            self._write_response(404, NOT_FOUND_BODY)
 
     def do_POST(self):
         """Handle POST requests for MCP endpoints"""
@@ -54,69 +177,72 @@ class MCPHandler(BaseHTTPRequestHandler):
         elif self.path == "/v1/tools":
             self._handle_tools()
         else:
-            self.send_response(404)
-            self.end_headers()
-            response = {"error": "Not found"}
-            self.wfile.write(json.dumps(response).encode())
+            # The request body is left unread, so this connection can't be reused
+            self.close_connection = True
+            self._write_response(404, NOT_FOUND_BODY)
+
+    def _read_json_body(self):
+        """Read and parse the JSON request body.
+
+        The body is read straight into a buffer sized from Content-Length and
+        parsed from that buffer, without intermediate copies.
+
+        Returns:
+            The parsed JSON object, or None if an error response has already been sent
+        """
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            # The body's extent is unknown, so this connection can't be reused
+            self.close_connection = True
+            self._write_response(400, INVALID_LENGTH_BODY)
+            return None
 
-    def _handle_messages(self):
-        """Process /v1/messages API endpoint - wrapper for Claude API"""
-        # Get request body
-        content_length = int(self.headers.get("Content-Length", 0))
         if content_length == 0:
-            self._set_headers()
-            response = {"error": "Empty request body"}
-            self.wfile.write(json.dumps(response).encode())
-            return
+            self._write_response(200, EMPTY_BODY_ERROR_BODY)
+            return None
+
+        if content_length > self.MAX_BODY:
+            # The oversized body is left unread, so this connection can't be reused
+            self.close_connection = True
+            self._write_response(413, BODY_TOO_LARGE_BODY)
+            return None
+
+        request_body = bytearray(content_length)
+        view = memoryview(request_body)
+        received = 0
+        while received < content_length:
+            read = self.rfile.readinto(view[received:])
+            if not read:
+                break
+            received += read
 
-        request_body = self.rfile.read(content_length)
         try:
-            request_data = json.loads(request_body)
-        except json.JSONDecodeError:
-            self.send_response(400)
-            self.end_headers()
-            response = {"error": "Invalid JSON"}
-            self.wfile.write(json.dumps(response).encode())
+            request_data = loads_json(view[:received])
+        except ValueError:
+            request_data = None
+
+        if not isinstance(request_data, dict):
+            self._write_response(400, INVALID_JSON_BODY)
+            return None
+        return request_data
+
+    def _handle_messages(self):
+        """Process /v1/messages API endpoint - wrapper for Claude API"""
+        request_data = self._read_json_body()
+        if request_data is None:
             return
 
         # The actual handling of Claude API calls would go here
-        # Instead, we'll return a notice that tool invocation should be used
-        self._set_headers()
-        response = {
-            "id": "msg_01234567890123456789012345",
-            "type": "message",
-            "role": "assistant",
-            "content": [
-                {
-                    "type": "text",
-                    "text": "This Model Context Protocol (MCP) server is configured for tool invocation only, not direct messaging. Please use the appropriate endpoints to interact with the Facebook Ads Uploader tool.",
-                }
-            ],
-            "model": "facebook-ads-uploader-tool",
-            "stop_reason": "end_turn",
-            "stop_sequence": None,
-            "usage": {"input_tokens": 0, "output_tokens": 0},
-        }
-        self.wfile.write(json.dumps(response).encode())
+        # Instead, we return a notice that tool invocation should be used
+        self._write_response(200, MESSAGES_NOTICE_BODY)
 
     def _handle_tools(self):
         """Process /v1/tools API endpoint for tool invocation"""
-        # Get request body
-        content_length = int(self.headers.get("Content-Length", 0))
-        if content_length == 0:
-            self._set_headers()
-            response = {"error": "Empty request body"}
-            self.wfile.write(json.dumps(response).encode())
-            return
-
-        request_body = self.rfile.read(content_length)
-        try:
-            request_data = json.loads(request_body)
-        except json.JSONDecodeError:
-            self.send_response(400)
-            self.end_headers()
-            response = {"error": "Invalid JSON"}
-            self.wfile.write(json.dumps(response).encode())
+        request_data = self._read_json_body()
+        if request_data is None:
             return
 
         # Process tool invocation
@@ -124,57 +250,61 @@ class MCPHandler(BaseHTTPRequestHandler):
             tool_name = request_data.get("name", "")
             parameters = request_data.get("parameters", {})
 
-            # Map tool names to functions
-            tool_functions = {
-                "create_maximizer_campaign": create_maximizer_campaign,
-                "ping": ping,
-            }
-
-            if tool_name not in tool_functions:
-                self.send_response(400)
-                self.end_headers()
+            func = TOOL_FUNCTIONS.get(tool_name)
+            if func is None:
                 response = {"error": f"Unknown tool: {tool_name}"}
-                self.wfile.write(json.dumps(response).encode())
+                self._send_json(response, 400)
                 return
 
-            # Get the function
-            func = tool_functions[tool_name]
-
-            # Extract expected parameters from function signature
-            sig = inspect.signature(func)
-            valid_params = {}
-
-            # Filter parameters based on function signature
-            for param_name, param in sig.parameters.items():
-                if param_name in parameters:
-                    valid_params[param_name] = parameters[param_name]
-                elif (
-                    param.default is inspect.Parameter.empty
-                    and not param.kind == inspect.Parameter.VAR_KEYWORD
-                ):
-                    # Required parameter missing
-                    self.send_response(400)
-                    self.end_headers()
-                    response = {"error": f"Missing required parameter: {param_name}"}
-                    self.wfile.write(json.dumps(response).encode())
-                    return
+            # Validate and filter parameters against the precomputed schema
+            schema = TOOL_SCHEMAS[tool_name]
+            missing = [name for name in schema["required"] if name not in parameters]
+            if missing:
+                # Required parameter missing
+                response = {"error": f"Missing required parameter: {missing[0]}"}
+                self._send_json(response, 400)
+                return
+
+            valid_params = {
+                name: value
+                for name, value in parameters.items()
+                if name in schema["accepted"]
+            }
 
             # Execute the function
             logger.info(f"Executing tool: {tool_name}")
-            result = func(**valid_params)
+            result = TOOL_EXECUTOR.submit(func, **valid_params).result()
 
             # Return success response
-            self._set_headers()
             response = {"status": "success", "result": result}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(response)
 
         except Exception as e:
             logger.error(f"Error processing tool request: {str(e)}")
             logger.error(traceback.format_exc())
-            self.send_response(500)
-            self.end_headers()
             response = {"error": f"Error: {str(e)}"}
-            self.wfile.write(json.dumps(response).encode())
+            self._send_json(response, 500)
+
+
+class MCPHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server, optionally sharing its port with other processes.
+
+    With FB_UPLOADER_REUSEPORT=1 the socket is bound with SO_REUSEPORT and the
+    kernel load-balances incoming connections across every process bound to the
+    port, for deployments that run several server processes to scale past one
+    interpreter's GIL. Otherwise a second server on the port fails with
+    EADDRINUSE instead of silently taking half of the traffic.
+    """
+
+    daemon_threads = True
+    # The default listen backlog of 5 drops connections under bursts
+    request_queue_size = 128
+    reuse_port = os.environ.get("FB_UPLOADER_REUSEPORT") == "1"
+
+    def server_bind(self):
+        if self.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
 
 
 class MCPServer:
@@ -199,7 +329,9 @@ class MCPServer:
         def run_server():
             """Run the server in a thread"""
             try:
-                server = HTTPServer(("0.0.0.0", self.port), MCPHandler)
+                # One thread per connection, so a long-running tool call (e.g. a
+                # campaign upload) doesn't block health checks or other requests
+                server = MCPHTTPServer(("0.0.0.0", self.port), MCPHandler)
                 self.server = server
                 logger.info(f"MCP server started on port {self.port}")
                 server.serve_forever()
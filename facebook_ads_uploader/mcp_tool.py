@@ -6,13 +6,19 @@ Model Context Protocol (MCP) to allow Claude to create Facebook ad campaigns
 directly from conversations.
 """
 
+import functools
 import json
 import logging
 import os
 import sys
+import queue
+import re
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
-from urllib.parse import urlparse, parse_qs
 
 from facebook_ads_uploader import config as config_module
 from facebook_ads_uploader import facebook_api
@@ -24,13 +30,67 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Concurrent campaign requests arriving within this window are handled as one batch
+BATCH_WINDOW_SECONDS = 0.05
+BATCH_MAX_SIZE = 8
+
+# Campaign uploads running at once, and how long a request waits for its result
+CAMPAIGN_MAX_WORKERS = 16
+CAMPAIGN_TIMEOUT_SECONDS = 1800
+
+DEFAULTS_CONFIG_PATH = "defaults.yaml"
+PLATFORMS_CONFIG_PATH = "platforms.yaml"
+
+
+def _config_mtime(path: str):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_configs_cached(defaults_mtime, platforms_mtime):
+    return (
+        config_module.load_config(DEFAULTS_CONFIG_PATH),
+        config_module.load_platforms_config(PLATFORMS_CONFIG_PATH),
+    )
+
+
+def load_configs():
+    """
+    Return (config, platforms), parsing the YAML files only when they change.
+
+    Returns:
+        Tuple of the defaults config dict and the platforms dict
+    """
+    return _load_configs_cached(
+        _config_mtime(DEFAULTS_CONFIG_PATH), _config_mtime(PLATFORMS_CONFIG_PATH)
+    )
+
+
+# ASCII translation table mapping every non-alphanumeric character to "_"
+_SANITIZE_TABLE = {c: c if chr(c).isalnum() else ord("_") for c in range(128)}
+
+# Google Drive file ID from /file/d/FILE_ID/... or ?id=FILE_ID
+_DRIVE_ID_RE = re.compile(r"(?:file/d/|[?&]id=)([A-Za-z0-9_-]+)")
+
 
 def sanitize_string(s):
     """Sanitize a string for use in a filename or URL"""
     if not s:
         return ""
+    s = str(s)
     # Replace spaces and special characters with underscores
-    return "".join(c if c.isalnum() else "_" for c in str(s))
+    if s.isascii():
+        return s.translate(_SANITIZE_TABLE)
+    return "".join(c if c.isalnum() else "_" for c in s)
+
+
+@functools.lru_cache(maxsize=1)
+def _today_ddmm(epoch_minute: int) -> str:
+    """Return the local DD-MM date for an epoch minute, formatted once per minute."""
+    return datetime.fromtimestamp(epoch_minute * 60).strftime("%d-%m")
 
 
 def extract_google_drive_id(url):
@@ -41,19 +101,286 @@ def extract_google_drive_id(url):
     if not url or "drive.google.com" not in url:
         return None
 
-    parsed_url = urlparse(url)
+    # Formats: https://drive.google.com/file/d/FILE_ID/view
+    #          https://drive.google.com/open?id=FILE_ID
+    match = _DRIVE_ID_RE.search(url)
+    return match.group(1) if match else None
+
+
+class CampaignBatcher:
+    """
+    Collects concurrent create_maximizer_campaign calls into short batches.
+
+    Calls arriving within BATCH_WINDOW_SECONDS of each other are grouped by
+    platform and handed to a long-lived executor, so the collector keeps
+    draining the queue while earlier uploads run. The SDK keeps its default API
+    in a global, so uploads only run concurrently with uploads that use the same
+    credentials: the Facebook API is re-initialized once the running uploads for
+    other credentials have finished.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = BATCH_WINDOW_SECONDS,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_workers: int = CAMPAIGN_MAX_WORKERS,
+        timeout: float = CAMPAIGN_TIMEOUT_SECONDS,
+    ):
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="campaign"
+        )
+        # Credentials the Facebook API was last initialized with, the number of
+        # uploads running with them and of uploads waiting to switch credentials
+        self._api_condition = threading.Condition()
+        self._active_credentials = None
+        self._active_uploads = 0
+        self._waiting_switches = 0
+
+    def submit(self, prepared: dict) -> dict:
+        """
+        Queue a prepared campaign and wait up to self.timeout for its result.
+
+        On timeout an error result is returned; the upload itself keeps running.
+        """
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((prepared, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            logger.error(
+                f"Campaign '{prepared['campaign_name']}' still running after {self.timeout}s"
+            )
+            return {
+                "status": "error",
+                "message": f"Timed out after {self.timeout}s waiting for campaign "
+                f"'{prepared['campaign_name']}'",
+            }
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def _acquire_api(self, platform_config: dict):
+        """
+        Wait until the Facebook API can be used with the platform's credentials.
+
+        The API is re-initialized for other credentials once no upload is running
+        with the active ones. While such a switch is pending, new uploads with the
+        active credentials wait too, so a busy platform can't starve the others.
+        """
+        credentials = tuple(
+            platform_config.get(key)
+            for key in ("app_id", "app_secret", "access_token", "api_version")
+        )
+        with self._api_condition:
+            switching = False
+            try:
+                while True:
+                    if credentials == self._active_credentials:
+                        # Only other uploads' pending switches hold this one back
+                        if self._waiting_switches == int(switching):
+                            break
+                    elif not self._active_uploads:
+                        facebook_api.init_facebook_api(*credentials)
+                        self._active_credentials = credentials
+                        break
+                    elif not switching:
+                        switching = True
+                        self._waiting_switches += 1
+                    self._api_condition.wait()
+                self._active_uploads += 1
+            finally:
+                if switching:
+                    self._waiting_switches -= 1
+                    self._api_condition.notify_all()
+
+    def _release_api(self):
+        with self._api_condition:
+            self._active_uploads -= 1
+            if not self._active_uploads:
+                self._api_condition.notify_all()
+
+    def _collect_batch(self) -> list:
+        """Wait for one call, then gather whatever else arrives within the window."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _upload(self, prepared: dict, future: Future):
+        """Run one upload under its platform's credentials and set its result."""
+        try:
+            self._acquire_api(prepared["platform_config"])
+        except Exception as e:
+            logger.error(f"Error initializing Facebook API: {str(e)}")
+            future.set_result({"status": "error", "message": str(e)})
+            return
+        try:
+            future.set_result(upload_prepared_campaign(prepared))
+        except Exception as e:
+            future.set_result({"status": "error", "message": str(e)})
+        finally:
+            self._release_api()
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            by_platform = {}
+            for prepared, future in batch:
+                by_platform.setdefault(prepared["platform_id"], []).append(
+                    (prepared, future)
+                )
+
+            # Submitted platform by platform, so each group's uploads share one
+            # initialization of the API
+            for platform_id, items in by_platform.items():
+                logger.info(
+                    f"Running batch of {len(items)} campaign(s) for platform '{platform_id}'"
+                )
+                for prepared, future in items:
+                    self._executor.submit(self._upload, prepared, future)
+
+
+def prepare_campaign(
+    topic: str,
+    country: str,
+    title: str,
+    body: str,
+    query: str = None,
+    media_path: str = None,
+    extra_prompt: str = None,
+) -> dict:
+    """
+    Resolve the platform, record and campaign name for a create_maximizer_campaign call.
+
+    Returns:
+        Dict with platform_id, platform_config, config, campaign_name and record, or
+        an error result dict with "status": "error"
+    """
+    # Load configuration (cached until the files change)
+    config, platforms = load_configs()
+
+    # Use fb api as default platform
+    platform_id = "fb api"
+
+    # Parse extra_prompt for additional configuration
+    extra_config = {}
+    if extra_prompt:
+        # Example format: "platform: fb api 2, device: ios_only"
+        parts = [p.strip() for p in extra_prompt.split(",")]
+        for part in parts:
+            if ":" in part:
+                key, value = [p.strip() for p in part.split(":", 1)]
+                extra_config[key.lower()] = value
+
+        # Check if platform is specified
+        if "platform" in extra_config and extra_config["platform"] in platforms:
+            platform_id = extra_config["platform"]
+            logger.info(f"Using specified platform: {platform_id}")
+
+    # Get platform configuration
+    platform_config = platforms.get(platform_id)
+    if not platform_config:
+        return {
+            "status": "error",
+            "message": f"Platform '{platform_id}' not found in configuration",
+        }
+
+    # Create a record dict similar to what we'd get from the spreadsheet
+    record = {
+        "Topic": topic,
+        "Country": country,
+        "Title": title,
+        "Body": body,
+        "Query": query or "",
+        "Media Path": media_path or "",
+        "Special Ad Category": extra_config.get("special_ad_category", ""),
+    }
+
+    # Add device targeting if specified
+    if "device" in extra_config and extra_config["device"].lower() in [
+        "all",
+        "android_only",
+        "ios_only",
+    ]:
+        record["Device Targeting"] = extra_config["device"]
+
+    # Generate a campaign name
+    display_date = _today_ddmm(int(time.time() // 60))
+    country_code = facebook_api.normalize_country_code(country)
+    campaign_name = f"{sanitize_string(topic)}_{country_code}_Agent_A_{display_date}"
+
+    # Process media URLs - if they're Google Drive links, note that they need special handling
+    if media_path and "drive.google.com" in media_path:
+        # Note: In a production environment, you would implement a function to
+        # download from Google Drive using the Drive API and the file ID
+        logger.warning(
+            "Google Drive links require additional authentication - will use URL directly"
+        )
+
+    return {
+        "platform_id": platform_id,
+        "platform_config": platform_config,
+        "config": config,
+        "campaign_name": campaign_name,
+        "record": record,
+    }
+
+
+def upload_prepared_campaign(prepared: dict) -> dict:
+    """
+    Upload a campaign prepared by prepare_campaign.
+
+    The Facebook API must already be initialized for the campaign's platform.
+
+    Returns:
+        Dict containing status and details of the operation
+    """
+    platform_config = prepared["platform_config"]
+    campaign_name = prepared["campaign_name"]
+    ad_account_id = platform_config.get("ad_account_id")
+    page_id = platform_config.get("page_id")
+    pixel_id = platform_config.get("pixel_id")
+
+    try:
+        campaign_id = facebook_api.upload_campaign(
+            ad_account_id,
+            page_id,
+            pixel_id,
+            campaign_name,
+            prepared["record"],
+            prepared["config"],
+        )
+    except Exception as e:
+        logger.error(f"Error creating campaign: {str(e)}")
+        return {"status": "error", "message": str(e)}
 
-    # Format: https://drive.google.com/file/d/FILE_ID/view
-    if "file/d/" in url:
-        file_id = url.split("file/d/")[1].split("/")[0]
-        return file_id
+    return {
+        "status": "success",
+        "message": f"Campaign '{campaign_name}' created successfully",
+        "campaign_id": campaign_id,
+        "platform": prepared["platform_id"],
+        "ad_account_id": ad_account_id,
+    }
 
-    # Format: https://drive.google.com/open?id=FILE_ID
-    query_params = parse_qs(parsed_url.query)
-    if "id" in query_params:
-        return query_params["id"][0]
 
-    return None
+CAMPAIGN_BATCHER = CampaignBatcher()
 
 
 def create_maximizer_campaign(
@@ -68,6 +395,9 @@ def create_maximizer_campaign(
     """
     Create a Facebook ad campaign directly through MCP function calls.
 
+    Concurrent calls are batched by CAMPAIGN_BATCHER so the Facebook API is
+    only re-initialized when the platform changes.
+
     Args:
         topic: Campaign topic/name
         country: Target country (name or 2-letter code)
@@ -83,99 +413,13 @@ def create_maximizer_campaign(
     logger.info(f"Creating campaign for topic: {topic}, country: {country}")
 
     try:
-        # Load configuration
-        config = config_module.load_config("defaults.yaml")
-        platforms = config_module.load_platforms_config("platforms.yaml")
-
-        # Use fb api as default platform
-        platform_id = "fb api"
-
-        # Parse extra_prompt for additional configuration
-        extra_config = {}
-        if extra_prompt:
-            # Example format: "platform: fb api 2, device: ios_only"
-            parts = [p.strip() for p in extra_prompt.split(",")]
-            for part in parts:
-                if ":" in part:
-                    key, value = [p.strip() for p in part.split(":", 1)]
-                    extra_config[key.lower()] = value
-
-            # Check if platform is specified
-            if "platform" in extra_config and extra_config["platform"] in platforms:
-                platform_id = extra_config["platform"]
-                logger.info(f"Using specified platform: {platform_id}")
-
-        # Get platform configuration
-        platform_config = platforms.get(platform_id)
-        if not platform_config:
-            return {
-                "status": "error",
-                "message": f"Platform '{platform_id}' not found in configuration",
-            }
-
-        # Initialize Facebook API
-        facebook_api.init_facebook_api(
-            platform_config.get("app_id"),
-            platform_config.get("app_secret"),
-            platform_config.get("access_token"),
-            platform_config.get("api_version"),
-        )
-
-        # Create a record dict similar to what we'd get from the spreadsheet
-        record = {
-            "Topic": topic,
-            "Country": country,
-            "Title": title,
-            "Body": body,
-            "Query": query or "",
-            "Media Path": media_path or "",
-            "Special Ad Category": extra_config.get("special_ad_category", ""),
-        }
-
-        # Add device targeting if specified
-        if "device" in extra_config and extra_config["device"].lower() in [
-            "all",
-            "android_only",
-            "ios_only",
-        ]:
-            record["Device Targeting"] = extra_config["device"]
-
-        # Generate a campaign name
-        display_date = datetime.now().strftime("%d-%m")
-        country_code = facebook_api.normalize_country_code(country)
-        campaign_name = (
-            f"{sanitize_string(topic)}_{country_code}_Agent_A_{display_date}"
-        )
-
-        # Process media URLs - if they're Google Drive links, note that they need special handling
-        if media_path and "drive.google.com" in media_path:
-            # Note: In a production environment, you would implement a function to
-            # download from Google Drive using the Drive API and the file ID
-            logger.warning(
-                "Google Drive links require additional authentication - will use URL directly"
-            )
-
-        # Upload campaign
-        ad_account_id = platform_config.get("ad_account_id")
-        page_id = platform_config.get("page_id")
-        pixel_id = platform_config.get("pixel_id")
-
-        campaign_id = facebook_api.upload_campaign(
-            ad_account_id,
-            page_id,
-            pixel_id,
-            campaign_name,
-            record,
-            config,
+        prepared = prepare_campaign(
+            topic, country, title, body, query, media_path, extra_prompt
         )
+        if prepared.get("status") == "error":
+            return prepared
 
-        return {
-            "status": "success",
-            "message": f"Campaign '{campaign_name}' created successfully",
-            "campaign_id": campaign_id,
-            "platform": platform_id,
-            "ad_account_id": ad_account_id,
-        }
+        return CAMPAIGN_BATCHER.submit(prepared)
 
     except Exception as e:
         logger.error(f"Error creating campaign: {str(e)}")
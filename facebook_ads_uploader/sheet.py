@@ -1,15 +1,46 @@
+import functools
 import gspread
+import itertools
 import logging
-from typing import List, Tuple, Dict, Any, Optional
-from time import sleep
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+import queue
+import random
+import threading
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from typing import List, Tuple, Dict, Any, Iterable, Optional
+from time import monotonic, sleep
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
 )
+
+# Logging is configured by the application, not on import
 logger = logging.getLogger(__name__)
 
+# Upper bounds for a single status update request
+MAX_CELLS_PER_REQUEST = 5000
+MAX_ROWS_PER_REQUEST = 2500
+
+# Status update batches written concurrently
+STATUS_UPDATE_MAX_WORKERS = 4
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(credentials_file: str):
+    """
+    Return a gspread client authenticated with the service account file.
+    Clients are cached, so the OAuth token exchange happens once per file;
+    google-auth refreshes the token as needed.
+    """
+    return gspread.service_account(filename=credentials_file)
+
+
+@functools.lru_cache(maxsize=8)
+def _open_spreadsheet(credentials_file: str, spreadsheet_id: str):
+    """Return the opened spreadsheet, cached per credentials file and ID."""
+    return _get_client(credentials_file).open_by_key(spreadsheet_id)
+
 
 def get_available_tabs(credentials_file: str, spreadsheet_id: str) -> list:
     """
@@ -23,8 +54,7 @@ def get_available_tabs(credentials_file: str, spreadsheet_id: str) -> list:
 
     try:
         # Authenticate and open the spreadsheet
-        gc = gspread.service_account(filename=credentials_file)
-        sh = gc.open_by_key(spreadsheet_id)
+        sh = _open_spreadsheet(credentials_file, spreadsheet_id)
 
         # Get all worksheets and extract their titles
         worksheets = sh.worksheets()
@@ -32,10 +62,76 @@ def get_available_tabs(credentials_file: str, spreadsheet_id: str) -> list:
 
         return tab_names
     except Exception as e:
-        logger.error(f"Failed to get available tabs: {e}")
+        logger.error("Failed to get available tabs: %s", e)
         return []
 
 
+def _is_retryable(error: Exception) -> bool:
+    """
+    Return True if a failed Sheets request is worth retrying.
+    Client errors (4xx) won't succeed on retry, except 429 (quota exceeded).
+    Errors without an HTTP status (network failures) are retried.
+    """
+    response = getattr(error, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if not isinstance(status_code, int):
+        return True
+    return status_code == 429 or status_code >= 500
+
+
+def _call_with_retries(func, *args, max_attempts=3, initial_delay=1.0, max_delay=10.0):
+    """
+    Call func(*args), retrying retryable failures with exponential backoff and jitter.
+    The last error is re-raised once max_attempts is reached.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func(*args)
+        except Exception as e:
+            attempt += 1
+            if attempt >= max_attempts or not _is_retryable(e):
+                raise
+            delay = min(max_delay, initial_delay * 2 ** (attempt - 1))
+            delay += random.uniform(0, initial_delay)
+            logger.warning(
+                "Attempt %d failed. Retrying in %.1f seconds... Error: %s",
+                attempt,
+                delay,
+                e,
+            )
+            sleep(delay)
+
+
+def _open_worksheet(credentials_file: str, spreadsheet_id: str, tab_name: str):
+    """Authenticate, open the spreadsheet and return the worksheet for tab_name."""
+    sh = _open_spreadsheet(credentials_file, spreadsheet_id)
+    try:
+        worksheet = sh.worksheet(tab_name)
+        logger.info("Successfully opened worksheet '%s'", tab_name)
+        return worksheet
+    except Exception as e:
+        logger.error("Could not open tab '%s': %s", tab_name, e)
+        # Try again with forward slash conversion (in case of date format issue)
+        alt_tab_name = tab_name.replace("/", "-")
+        try:
+            worksheet = sh.worksheet(alt_tab_name)
+            logger.info("Opened worksheet using alternative name '%s'", alt_tab_name)
+            return worksheet
+        except Exception:
+            logger.error(
+                "Could not open tab with alternative name '%s' either", alt_tab_name
+            )
+
+            # Get available tabs to provide helpful error message
+            available_tabs = [ws.title for ws in sh.worksheets()]
+            logger.info("Available tabs: %s", ", ".join(available_tabs))
+
+            raise RuntimeError(
+                f"Could not open tab '{tab_name}'. Available tabs: {', '.join(available_tabs)}"
+            )
+
+
 def get_rows_to_upload(credentials_file: str, spreadsheet_id: str, tab_name: str):
     """
     Connect to Google Sheets using a service account and retrieve all rows from the specified tab.
@@ -52,95 +148,59 @@ def get_rows_to_upload(credentials_file: str, spreadsheet_id: str, tab_name: str
         raise ValueError("Tab name is required")
 
     # Authenticate and open the spreadsheet with retries
-    max_retries = 3
-    retry_count = 0
-    last_error = None
-    worksheet = None
+    try:
+        worksheet = _call_with_retries(
+            _open_worksheet, credentials_file, spreadsheet_id, tab_name
+        )
+    except Exception as e:
+        logger.error("All attempts to connect to Google Sheets failed")
 
-    while retry_count < max_retries:
+        # Get available tabs
         try:
-            # Authenticate and open the spreadsheet
-            gc = gspread.service_account(filename=credentials_file)
-            sh = gc.open_by_key(spreadsheet_id)
-            try:
-                worksheet = sh.worksheet(tab_name)
-                logger.info(f"Successfully opened worksheet '{tab_name}'")
-                break  # Break the retry loop if successful
-            except Exception as e:
-                last_error = e
-                logger.error(f"Could not open tab '{tab_name}': {e}")
-                # Try again with forward slash conversion (in case of date format issue)
-                try:
-                    alt_tab_name = tab_name.replace("/", "-")
-                    worksheet = sh.worksheet(alt_tab_name)
-                    logger.info(
-                        f"Opened worksheet using alternative name '{alt_tab_name}'"
-                    )
-                    break  # Break the retry loop if successful
-                except Exception:
-                    logger.error(
-                        f"Could not open tab with alternative name '{alt_tab_name}' either"
-                    )
-
-                    # Get available tabs to provide helpful error message
-                    available_tabs = [ws.title for ws in sh.worksheets()]
-                    logger.info(f"Available tabs: {', '.join(available_tabs)}")
-
-                    raise RuntimeError(
-                        f"Could not open tab '{tab_name}'. Available tabs: {', '.join(available_tabs)}"
-                    )
-        except Exception as e:
-            last_error = e
-            retry_count += 1
-            if retry_count < max_retries:
-                logger.warning(
-                    f"Attempt {retry_count} failed. Retrying in 2 seconds... Error: {e}"
-                )
-                sleep(2)  # Wait before retrying
-            else:
-                logger.error(
-                    f"All {max_retries} attempts to connect to Google Sheets failed"
-                )
-
-                # Get available tabs
-                try:
-                    gc = gspread.service_account(filename=credentials_file)
-                    sh = gc.open_by_key(spreadsheet_id)
-                    available_tabs = [ws.title for ws in sh.worksheets()]
-                    raise RuntimeError(
-                        f"Failed to connect to Google Sheets after {max_retries} attempts: {e}\n"
-                        f"Available tabs: {', '.join(available_tabs)}"
-                    )
-                except:
-                    # If we can't even get the tabs list, just raise the original error
-                    raise RuntimeError(
-                        f"Failed to connect to Google Sheets after {max_retries} attempts: {e}"
-                    )
-
-    if not worksheet:
-        raise RuntimeError(f"Could not open worksheet: {last_error}")
-
-    # Fetch all records from the sheet
+            sh = _open_spreadsheet(credentials_file, spreadsheet_id)
+            available_tabs = [ws.title for ws in sh.worksheets()]
+        except Exception:
+            # If we can't even get the tabs list, just raise the original error
+            raise RuntimeError(f"Failed to connect to Google Sheets: {e}")
+        raise RuntimeError(
+            f"Failed to connect to Google Sheets: {e}\n"
+            f"Available tabs: {', '.join(available_tabs)}"
+        )
+
+    # Fetch all values from the sheet in a single request; the header row gives the keys
     try:
-        records = worksheet.get_all_records()
-        logger.info(f"Retrieved {len(records)} records from worksheet")
+        all_values = worksheet.get_all_values()
+        logger.info("Retrieved %d records from worksheet", max(len(all_values) - 1, 0))
     except Exception as e:
-        logger.error(f"Failed to get records from worksheet: {e}")
+        logger.error("Failed to get records from worksheet: %s", e)
         raise RuntimeError(f"Failed to get records from worksheet: {e}")
 
-    rows_to_process = []
+    if not all_values:
+        return worksheet, []
+
+    header = tuple(all_values[0])
+    width = len(header)
 
     # Get all rows, including the special ad category and device targeting columns
     # The decision to filter will be handled in main.py
-    for idx, record in enumerate(
-        records, start=2
-    ):  # data starts at row 2 (row 1 is header)
-        # Add the row to be processed
-        rows_to_process.append((idx, record))
+    rows_to_process = [
+        (idx, dict(zip(header, row if len(row) >= width else row + [""] * width)))
+        for idx, row in enumerate(
+            all_values[1:], start=2
+        )  # data starts at row 2 (row 1 is header)
+    ]
 
     return worksheet, rows_to_process
 
 
+def _is_grid_limit_error(error: Exception) -> bool:
+    """Return True if error means the sheet has no room for more columns."""
+    message = str(error).lower()
+    # "exceeds grid limits" when writing past the last column, "above the limit"
+    # when adding columns would exceed the spreadsheet's cell limit
+    return "exceeds grid limits" in message or "above the limit" in message
+
+
 def ensure_status_columns(worksheet) -> Tuple[int, int]:
     """
     Ensure that 'Status' and 'Error' columns exist in the worksheet.
@@ -148,249 +208,396 @@ def ensure_status_columns(worksheet) -> Tuple[int, int]:
     """
     try:
         header = worksheet.row_values(1)
-        logger.debug(f"Header row: {header}")
-        status_col_index = None
-        error_col_index = None
-
-        # Check for "Status" column (case-insensitive)
-        status_col_names = ["Status", "status", "STATUS"]
-        for col_name in status_col_names:
-            if col_name in header:
-                status_col_index = header.index(col_name) + 1  # convert to 1-indexed
-                logger.debug(f"Found Status column at index {status_col_index}")
-                break
-
-        # Check for "Error" column (case-insensitive)
-        error_col_names = ["Error", "error", "ERROR"]
-        for col_name in error_col_names:
-            if col_name in header:
-                error_col_index = header.index(col_name) + 1  # convert to 1-indexed
-                logger.debug(f"Found Error column at index {error_col_index}")
-                break
-
-        # Add Status column if not found
-        if status_col_index is None:
+        logger.debug("Header row: %s", header)
+
+        # Case-insensitive, whitespace-tolerant lookup of the existing columns;
+        # the first matching column wins
+        normalized = {}
+        for i, name in enumerate(header, start=1):
+            normalized.setdefault(name.strip().casefold(), i)
+        status_col_index = normalized.get("status")
+        error_col_index = normalized.get("error")
+        logger.debug(
+            "Status column index: %s, Error column index: %s",
+            status_col_index,
+            error_col_index,
+        )
+
+        missing = [
+            name
+            for name, col_index in (
+                ("Status", status_col_index),
+                ("Error", error_col_index),
+            )
+            if col_index is None
+        ]
+        if missing:
             next_col = len(header) + 1
+            last_col = next_col + len(missing) - 1
             try:
-                # Try to add the Status column
-                worksheet.update_cell(1, next_col, "Status")
-                status_col_index = next_col
-                header.append("Status")
-                logger.info(f"Added Status column at index {status_col_index}")
+                # Expand the grid once for all missing columns if they don't fit;
+                # col_count is known locally, so this needs no metadata fetch
+                needed = last_col + 2 - worksheet.col_count  # 2 extra for safety
+                if last_col > worksheet.col_count:
+                    worksheet.add_cols(needed)
+                    logger.info("Expanded sheet to %d columns", worksheet.col_count)
+                # Write all missing header cells in a single request
+                worksheet.batch_update(
+                    [
+                        {
+                            "range": f"{rowcol_to_a1(1, next_col)}:{rowcol_to_a1(1, last_col)}",
+                            "values": [missing],
+                        }
+                    ]
+                )
+                header.extend(missing)
+                new_cols = list(range(next_col, last_col + 1))
             except Exception as e:
-                if "exceeds grid limits" in str(e):
-                    # Handle grid limits error by expanding the sheet first
-                    try:
-                        # Get the current number of columns in the sheet
-                        properties = worksheet.spreadsheet.fetch_sheet_metadata().get(
-                            "sheets", []
-                        )
-                        for sheet in properties:
-                            if (
-                                sheet.get("properties", {}).get("title")
-                                == worksheet.title
-                            ):
-                                current_cols = (
-                                    sheet.get("properties", {})
-                                    .get("gridProperties", {})
-                                    .get("columnCount", 0)
-                                )
-                                break
-                        else:
-                            current_cols = 0
-
-                        # Expand the grid with enough columns
-                        if current_cols > 0 and next_col > current_cols:
-                            # Request to resize the sheet
-                            worksheet.spreadsheet.batch_update(
-                                {
-                                    "requests": [
-                                        {
-                                            "updateSheetProperties": {
-                                                "properties": {
-                                                    "sheetId": worksheet.id,
-                                                    "gridProperties": {
-                                                        "columnCount": next_col
-                                                        + 2  # Add 2 extra columns for safety
-                                                    },
-                                                },
-                                                "fields": "gridProperties.columnCount",
-                                            }
-                                        }
-                                    ]
-                                }
-                            )
-                            logger.info(f"Expanded sheet to {next_col + 2} columns")
-
-                            # Now try to add the Status column again
-                            worksheet.update_cell(1, next_col, "Status")
-                            status_col_index = next_col
-                            header.append("Status")
-                            logger.info(
-                                f"Added Status column at index {status_col_index} after expanding sheet"
-                            )
-                    except Exception as expand_err:
-                        logger.error(f"Failed to expand sheet: {expand_err}")
-                        # Fallback to reuse an existing column if possible
-                        if len(header) >= 2:
-                            fallback_col = len(header)  # Use last column as fallback
-                            worksheet.update_cell(1, fallback_col, "Status")
-                            status_col_index = fallback_col
-                            header[fallback_col - 1] = (
-                                "Status"  # Update our local copy of header
-                            )
-                            logger.info(
-                                f"Used column {fallback_col} for Status as fallback"
-                            )
-                        else:
-                            # If all else fails, raise the exception
-                            raise RuntimeError(f"Could not add Status column: {e}")
-                else:
-                    # For other types of errors, re-raise
-                    raise RuntimeError(f"Could not add Status column: {e}")
+                logger.error("Failed to add %s columns: %s", " and ".join(missing), e)
+                # Only a full grid is worked around; anything else (rate limits,
+                # permissions, server errors) must not rename user columns
+                if not _is_grid_limit_error(e):
+                    raise RuntimeError(
+                        f"Could not add {' and '.join(missing)} columns: {e}"
+                    )
+                # Fallback to reuse the last existing columns, skipping a column
+                # already used for Status or Error and keeping at least one other
+                resolved = {status_col_index, error_col_index}
+                reusable = [
+                    col for col in range(1, len(header) + 1) if col not in resolved
+                ]
+                if len(reusable) <= len(missing):
+                    raise RuntimeError(
+                        f"Could not add {' and '.join(missing)} columns: {e}"
+                    )
+                new_cols = reusable[-len(missing) :]
+                worksheet.batch_update(
+                    [
+                        {"range": rowcol_to_a1(1, col), "values": [[name]]}
+                        for col, name in zip(new_cols, missing)
+                    ]
+                )
+                for col, name in zip(new_cols, missing):
+                    header[col - 1] = name
+                logger.info(
+                    "Used column(s) %s for %s as fallback",
+                    ", ".join(map(str, new_cols)),
+                    " and ".join(missing),
+                )
 
-        # Add Error column if not found
-        if error_col_index is None:
-            next_col = len(header) + 1
-            try:
-                # Try to add the Error column
-                worksheet.update_cell(1, next_col, "Error")
-                error_col_index = next_col
-                header.append("Error")
-                logger.info(f"Added Error column at index {error_col_index}")
-            except Exception as e:
-                if "exceeds grid limits" in str(e):
-                    # Handle grid limits error by expanding the sheet first
-                    try:
-                        # Get the current number of columns in the sheet
-                        properties = worksheet.spreadsheet.fetch_sheet_metadata().get(
-                            "sheets", []
-                        )
-                        for sheet in properties:
-                            if (
-                                sheet.get("properties", {}).get("title")
-                                == worksheet.title
-                            ):
-                                current_cols = (
-                                    sheet.get("properties", {})
-                                    .get("gridProperties", {})
-                                    .get("columnCount", 0)
-                                )
-                                break
-                        else:
-                            current_cols = 0
-
-                        # Expand the grid with enough columns
-                        if current_cols > 0 and next_col > current_cols:
-                            # Request to resize the sheet
-                            worksheet.spreadsheet.batch_update(
-                                {
-                                    "requests": [
-                                        {
-                                            "updateSheetProperties": {
-                                                "properties": {
-                                                    "sheetId": worksheet.id,
-                                                    "gridProperties": {
-                                                        "columnCount": next_col
-                                                        + 2  # Add 2 extra columns for safety
-                                                    },
-                                                },
-                                                "fields": "gridProperties.columnCount",
-                                            }
-                                        }
-                                    ]
-                                }
-                            )
-                            logger.info(f"Expanded sheet to {next_col + 2} columns")
-
-                            # Now try to add the Error column again
-                            worksheet.update_cell(1, next_col, "Error")
-                            error_col_index = next_col
-                            header.append("Error")
-                            logger.info(
-                                f"Added Error column at index {error_col_index} after expanding sheet"
-                            )
-                    except Exception as expand_err:
-                        logger.error(f"Failed to expand sheet: {expand_err}")
-                        # Fallback to reuse an existing column if possible
-                        if len(header) >= 1:
-                            fallback_col = len(header)  # Use last column as fallback
-                            worksheet.update_cell(1, fallback_col, "Error")
-                            error_col_index = fallback_col
-                            header[fallback_col - 1] = (
-                                "Error"  # Update our local copy of header
-                            )
-                            logger.info(
-                                f"Used column {fallback_col} for Error as fallback"
-                            )
-                        else:
-                            # If all else fails, raise the exception
-                            raise RuntimeError(f"Could not add Error column: {e}")
+            for col, name in zip(new_cols, missing):
+                if name == "Status":
+                    status_col_index = col
                 else:
-                    # For other types of errors, re-raise
-                    raise RuntimeError(f"Could not add Error column: {e}")
+                    error_col_index = col
+                logger.info("Added %s column at index %d", name, col)
 
         return status_col_index, error_col_index
     except Exception as e:
-        logger.error(f"Error ensuring status columns: {e}")
+        logger.error("Error ensuring status columns: %s", e)
         raise RuntimeError(f"Failed to ensure status columns: {e}")
 
 
+def _build_status_ranges(
+    results: List[Tuple[int, str, str]], status_col: int, error_col: int
+) -> List[Dict[str, Any]]:
+    """
+    Build values.batchUpdate ranges covering the Status and Error cells of results.
+
+    Rows are grouped into runs of consecutive row indices, and each run is written as
+    one range (or one range per column when the two columns aren't adjacent).
+    None values are sent as null, which the Sheets API skips, leaving the cell as is.
+    """
+    rows = {}
+    for row_index, status, error in results:
+        if status is None and error is None:
+            continue
+        if error:
+            # Truncate very long error messages to avoid API issues
+            error_text = str(error)
+            if len(error_text) > 1000:
+                error = error_text[:997] + "..."
+        rows[row_index] = (status, error)
+
+    runs = []
+    for row_index in sorted(rows):
+        if runs and row_index == runs[-1][-1] + 1:
+            runs[-1].append(row_index)
+        else:
+            runs.append([row_index])
+
+    ranges = []
+    for run in runs:
+        first_row, last_row = run[0], run[-1]
+        if abs(error_col - status_col) == 1:
+            # Adjacent columns: one rectangular range, in sheet column order
+            left_col = min(status_col, error_col)
+            values = [
+                list(rows[row]) if left_col == status_col else list(rows[row])[::-1]
+                for row in run
+            ]
+            ranges.append(
+                {
+                    "range": f"{rowcol_to_a1(first_row, left_col)}:{rowcol_to_a1(last_row, left_col + 1)}",
+                    "values": values,
+                }
+            )
+        else:
+            for col, pos in ((status_col, 0), (error_col, 1)):
+                ranges.append(
+                    {
+                        "range": f"{rowcol_to_a1(first_row, col)}:{rowcol_to_a1(last_row, col)}",
+                        "values": [[rows[row][pos]] for row in run],
+                    }
+                )
+    return ranges
+
+
 def update_status_rows(
-    worksheet, status_col: int, error_col: int, results: List[Tuple[int, str, str]]
+    worksheet,
+    status_col: int,
+    error_col: int,
+    results: List[Tuple[int, str, str]],
+    current_values: Optional[Dict[int, Tuple[Optional[str], Optional[str]]]] = None,
 ):
     """
     Update the Status and Error columns for each row in results.
     `results` is a list of (row_index, status, error_message).
 
+    `current_values` optionally maps row_index to the (status, error) already in
+    the sheet; cells whose value wouldn't change are not written. None means the
+    current value is unknown.
+
     Implements batch updates with retries for API reliability.
     """
     if not worksheet or not results:
         logger.warning("No worksheet or results provided for status update")
         return
 
-    # Split updates into batches of 20 rows to avoid API limits
-    batch_size = 20
-    results_batches = [
-        results[i : i + batch_size] for i in range(0, len(results), batch_size)
-    ]
-    logger.info(f"Updating {len(results)} rows in {len(results_batches)} batches")
-
-    for batch_index, batch in enumerate(results_batches):
-        cells_to_update = []
-        for row_index, status, error in batch:
-            if status is not None:
-                cells_to_update.append(gspread.Cell(row_index, status_col, status))
-            if error is not None:
-                # Truncate very long error messages to avoid API issues
-                if error and len(str(error)) > 1000:
-                    error = str(error)[:997] + "..."
-                cells_to_update.append(gspread.Cell(row_index, error_col, error))
-
-        if cells_to_update:
-            max_retries = 3
-            retry_count = 0
-            success = False
-
-            while retry_count < max_retries and not success:
-                try:
-                    worksheet.update_cells(cells_to_update)
-                    logger.info(
-                        f"Successfully updated batch {batch_index+1}/{len(results_batches)} ({len(cells_to_update)} cells)"
-                    )
-                    success = True
-                    # Add a small delay between batches to avoid rate limiting
-                    if batch_index < len(results_batches) - 1:
-                        sleep(1)
-                except Exception as e:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        logger.warning(
-                            f"Batch update attempt {retry_count} failed. Retrying in 2 seconds... Error: {e}"
-                        )
-                        sleep(2)  # Wait before retrying
-                    else:
-                        logger.error(
-                            f"Failed to update status batch after {max_retries} attempts: {e}"
-                        )
-                        raise RuntimeError(f"Failed to update status batch: {e}")
+    changed_results = results
+    if current_values:
+        changed_results = _drop_unchanged_values(results, current_values)
+
+    batches = _iter_status_batches(changed_results)
+    first_batch = next(batches, None)
+    if first_batch is None:
+        # Every row has neither a status nor an error: nothing to write
+        logger.debug("No status or error values to write")
+        return
+    logger.debug("Updating %d rows", len(results))
+    started = monotonic()
+    total_cells = 0
+    batch_count = 0
+
+    second_batch = next(batches, None)
+    if second_batch is None:
+        # Fast path: a single request, e.g. consecutive rows with adjacent Status and
+        # Error columns, which _build_status_ranges turns into one rectangular range.
+        # Write it on this thread without starting a pool
+        ranges = _build_status_ranges(first_batch, status_col, error_col)
+        total_cells = _write_batch(worksheet, ranges, 1)
+        logger.info(
+            "Wrote %d cells across 1 batch in %.2fs", total_cells, monotonic() - started
+        )
+        return
+
+    # The writes are pure network I/O, so a few can be in flight at once. Batches
+    # are built lazily and at most two per worker are queued, so memory stays
+    # bounded by the batch size rather than the number of results
+    max_pending = STATUS_UPDATE_MAX_WORKERS * 2
+    with ThreadPoolExecutor(max_workers=STATUS_UPDATE_MAX_WORKERS) as executor:
+        pending = set()
+        for batch_number, batch in enumerate(
+            itertools.chain((first_batch, second_batch), batches), start=1
+        ):
+            ranges = _build_status_ranges(batch, status_col, error_col)
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total_cells += future.result()
+            pending.add(executor.submit(_write_batch, worksheet, ranges, batch_number))
+            batch_count = batch_number
+        for future in as_completed(pending):
+            total_cells += future.result()
+
+    logger.info(
+        "Wrote %d cells across %d batches in %.2fs",
+        total_cells,
+        batch_count,
+        monotonic() - started,
+    )
+
+
+def _drop_unchanged_values(
+    results: Iterable[Tuple[int, str, str]],
+    current_values: Dict[int, Tuple[Optional[str], Optional[str]]],
+):
+    """Yield results with values equal to the sheet's current cell values set to None."""
+    for row_index, status, error in results:
+        current_status, current_error = current_values.get(row_index, (None, None))
+        if current_status is not None and status == current_status:
+            status = None
+        if current_error is not None and error == current_error:
+            error = None
+        yield row_index, status, error
+
+
+def _iter_status_batches(results: Iterable[Tuple[int, str, str]]):
+    """
+    Yield batches of results sized by the number of cells they write, so each
+    request stays under the API size limits with as few round-trips as possible.
+    Rows with neither a status nor an error are skipped.
+    """
+    batch = []
+    batch_cells = 0
+    for result in results:
+        if result[1] is None and result[2] is None:
+            continue
+        if batch and (
+            batch_cells + 2 > MAX_CELLS_PER_REQUEST
+            or len(batch) >= MAX_ROWS_PER_REQUEST
+        ):
+            yield batch
+            batch = []
+            batch_cells = 0
+        batch.append(result)
+        batch_cells += 2
+    if batch:
+        yield batch
+
+
+def _write_batch(worksheet, ranges: List[Dict[str, Any]], batch_number: int) -> int:
+    """
+    Write one batch of status ranges, retrying failed requests.
+    Returns the number of cells written.
+    """
+    # Build the values.batchUpdate body directly rather than through
+    # worksheet.batch_update; RAW skips server-side parsing of the messages
+    body = {
+        "valueInputOption": "RAW",
+        "data": [
+            {
+                "range": absolute_range_name(worksheet.title, value_range["range"]),
+                "values": value_range["values"],
+            }
+            for value_range in ranges
+        ],
+    }
+    try:
+        _call_with_retries(worksheet.spreadsheet.values_batch_update, body)
+    except Exception as e:
+        logger.error("Failed to update status batch: %s", e)
+        raise RuntimeError(f"Failed to update status batch: {e}")
+    cell_count = sum(
+        len(value_range["values"]) * len(value_range["values"][0])
+        for value_range in ranges
+    )
+    logger.debug(
+        "Successfully updated batch %d (%d ranges, %d cells)",
+        batch_number,
+        len(ranges),
+        cell_count,
+    )
+    return cell_count
+
+
+class AsyncStatusUpdater:
+    """
+    Writes status results to the sheet from a background thread, so Sheets writes
+    overlap with the uploads still running.
+
+    Results passed to submit() are buffered and written with update_status_rows
+    once batch_size of them have accumulated, or flush_interval seconds after the
+    first one was buffered. close() writes whatever is left and stops the thread.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        worksheet,
+        status_col: int,
+        error_col: int,
+        current_values: Optional[Dict[int, Tuple[Optional[str], Optional[str]]]] = None,
+        batch_size: int = MAX_ROWS_PER_REQUEST,
+        flush_interval: float = 2.0,
+    ):
+        self.worksheet = worksheet
+        self.status_col = status_col
+        self.error_col = error_col
+        self.current_values = current_values
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._errors = []
+        self._thread = threading.Thread(
+            target=self._run, name="sheet-status-updater", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, result: Tuple[int, str, str]):
+        """Queue a (row_index, status, error_message) result for writing."""
+        self._queue.put(result)
+
+    def flush(self):
+        """Write all results submitted so far and wait until they are written."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """
+        Write the remaining results and stop the background thread.
+        Raises RuntimeError if any write failed.
+        """
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self._errors:
+            raise RuntimeError(
+                f"Failed to update {len(self._errors)} status batch(es): {self._errors[0]}"
+            )
+
+    def _run(self):
+        pending = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # flush interval elapsed
+
+            if item is self._STOP:
+                self._write(pending)
+                return
+            if isinstance(item, threading.Event):
+                self._write(pending)
+                pending = []
+                deadline = None
+                item.set()
+                continue
+            if item is not None:
+                pending.append(item)
+                if deadline is None:
+                    deadline = monotonic() + self.flush_interval
+                if len(pending) < self.batch_size:
+                    continue
+
+            self._write(pending)
+            pending = []
+            deadline = None
+
+    def _write(self, results: List[Tuple[int, str, str]]):
+        if not results:
+            return
+        try:
+            update_status_rows(
+                self.worksheet,
+                self.status_col,
+                self.error_col,
+                results,
+                current_values=self.current_values,
+            )
+        except Exception as e:
+            logger.error("Error writing status batch: %s", e)
+            self._errors.append(e)
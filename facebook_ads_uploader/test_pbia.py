@@ -24,17 +24,20 @@ Usage:
   --video-url [URL] : Test with a specific video URL
 """
 
+import asyncio
+import functools
 import os
 import sys
 import argparse
 import logging
 import tempfile
 import json
-from facebook_business.api import FacebookAdsApi
-from facebook_business.adobjects.adaccount import AdAccount
-from facebook_business.adobjects.adimage import AdImage
-from facebook_business.adobjects.advideo import AdVideo
-from facebook_business.adobjects.adcreative import AdCreative
+from facebook_ads_uploader.video_downloader import download_video_from_url
+from facebook_ads_uploader.graph_rate_limit import (
+    GRAPH_LIMITER,
+    check_usage_headers,
+    rate_limited_call,
+)
 
 # Setup logging
 logging.basicConfig(
@@ -52,6 +55,30 @@ DEFAULT_VIDEO_URL = "https://video-lax3-2.xx.fbcdn.net/v/t42.1790-2/495707522_14
 REAL_WORLD_IMAGE_URL = "https://storage.googleapis.com/demand-ad-library-media/1868213520594640_20250516_040252.jpg"
 REAL_WORLD_VIDEO_URL = "https://video-lax3-2.xx.fbcdn.net/v/t42.1790-2/495707522_1445529606816105_5534285781827598734_n.mp4?_nc_cat=105&ccb=1-7&_nc_sid=5e8043&efg=e30%3D&_nc_ohc=b95P65B52rQAX-dkDB6&_nc_ht=video-lax3-2.xx&oh=00_AfAGmtbwlwTpiBd8Lr0XP-vdYk6-PBD7qOdkAe5NQY5rYA&oe=65781E16"
 
+# Fields read back from a created creative to verify its PBIA settings
+CREATIVE_VERIFY_FIELDS = ["id", "name", "object_story_spec", "thumbnail_url"]
+
+# Maximum number of calls in one Graph API batch request
+GRAPH_BATCH_LIMIT = 50
+
+# Pooled keep-alive connections kept open to the Graph API
+GRAPH_POOL_SIZE = 10
+
+# Static parts of the test creative specs
+_BASE_CALL_TO_ACTION = {"type": "LEARN_MORE", "value": {"link": "https://facebook.com"}}
+_BASE_LINK_DATA = {
+    "link": "https://facebook.com",
+    "message": "PBIA Test Message",
+    "name": "PBIA Test Headline",
+    "description": "PBIA Integration Test Description",
+    "call_to_action": _BASE_CALL_TO_ACTION,
+}
+_BASE_VIDEO_DATA = {
+    "title": "PBIA Test Video",
+    "message": "Testing PBIA integration with video",
+    "call_to_action": _BASE_CALL_TO_ACTION,
+}
+
 
 def load_fb_credentials():
     """Load Facebook API credentials from environment variables."""
@@ -89,214 +116,338 @@ def load_fb_credentials():
 
 def init_facebook_api(credentials):
     """Initialize the Facebook API client."""
+    from facebook_business.api import FacebookAdsApi
+    from requests.adapters import HTTPAdapter
+
     try:
-        FacebookAdsApi.init(
+        api = FacebookAdsApi.init(
             credentials["app_id"],
             credentials["app_secret"],
             credentials["access_token"],
             api_version="v22.0",
         )
+        # Keep enough pooled keep-alive connections to graph.facebook.com for
+        # the concurrent video uploads, so none are discarded and re-opened
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=GRAPH_POOL_SIZE)
+        api._session.requests.mount("https://", adapter)
         logger.info("Facebook API initialized successfully")
         return True
     except Exception as e:
-        logger.error(f"Failed to initialize Facebook API: {e}")
+        logger.error("Failed to initialize Facebook API: %s", e)
         return False
 
 
+def build_image_creative_spec(credentials, image_url):
+    """Build the PBIA test creative spec for an image URL."""
+    # Explicitly set use_page_actor_override to true
+    return {
+        "name": "PBIA Test Image Creative",
+        "object_story_spec": {
+            "page_id": credentials["page_id"],
+            "link_data": {**_BASE_LINK_DATA, "picture": image_url},
+            "use_page_actor_override": True,  # This is the key parameter for PBIA
+            "instagram_user_id": credentials["pbia"],
+        },
+    }
+
+
+def upload_test_video(credentials, video_url):
+    """
+    Upload a video from its URL and return the new video ID.
+
+    The video is downloaded locally and sent with the SDK's resumable chunked
+    upload (start/transfer/finish), the same way upload_campaign does, rather
+    than making Facebook fetch the URL itself.
+    """
+    from facebook_business.adobjects.advideo import AdVideo
+
+    logger.info("First uploading video to get a video ID...")
+    video_path = download_video_from_url(video_url)
+    try:
+        video = AdVideo(parent_id=credentials["ad_account_id"])
+        video[AdVideo.Field.name] = "PBIA Test Video"
+        video[AdVideo.Field.filepath] = video_path
+        rate_limited_call(video.remote_create)
+    finally:
+        try:
+            os.remove(video_path)
+        except OSError:
+            pass
+    video_id = video["id"]
+    logger.info("Successfully created video with ID: %s", video_id)
+    return video_id
+
+
+async def upload_test_videos(credentials, video_urls):
+    """
+    Upload several videos concurrently.
+
+    Each upload runs upload_test_video in a worker thread, so the downloads
+    and uploads overlap instead of running one after another.
+
+    Returns:
+        Dict mapping each successfully uploaded URL to its video ID. Failed
+        uploads are logged and left out.
+    """
+    unique_urls = list(dict.fromkeys(video_urls))
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(upload_test_video, credentials, url)
+            for url in unique_urls
+        ),
+        return_exceptions=True,
+    )
+
+    video_ids = {}
+    for url, result in zip(unique_urls, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to upload video: %s", result)
+        else:
+            video_ids[url] = result
+    return video_ids
+
+
+def build_video_creative_spec(credentials, video_id):
+    """Build the PBIA test creative spec for an uploaded video."""
+    return {
+        "name": "PBIA Test Video Creative",
+        "object_story_spec": {
+            "page_id": credentials["page_id"],
+            "video_data": {**_BASE_VIDEO_DATA, "video_id": video_id},
+            "use_page_actor_override": True,  # Key parameter for PBIA
+            "instagram_user_id": credentials["pbia"],
+        },
+    }
+
+
+def check_pbia_story_spec(kind, creative_id, story_spec, pbia_id):
+    """
+    Log a created creative's object_story_spec and check its PBIA settings.
+
+    Args:
+        kind: "image" or "video"
+        creative_id: ID of the created creative
+        story_spec: The creative's object_story_spec as returned by the Graph API
+        pbia_id: Expected Instagram user ID
+
+    Returns:
+        True if the creative has the PBIA configuration, False otherwise
+    """
+    label = kind.capitalize()
+    logger.info("\n=== %s Creative PBIA Verification ===", label)
+    logger.info("- Creative ID: %s", creative_id)
+    logger.info("- Page ID used: %s", story_spec.get("page_id"))
+    logger.info(
+        "- Instagram User ID: %s", story_spec.get("instagram_user_id", "NOT SET")
+    )
+
+    use_page_actor = story_spec.get("use_page_actor_override")
+    logger.info("- use_page_actor_override: %s", use_page_actor)
+
+    # Verify PBIA integration - sometimes the parameter is in the response
+    # but not shown in the object_story_spec
+    pbia_configured = bool(
+        story_spec.get("instagram_user_id") == pbia_id
+        and (
+            use_page_actor is True or use_page_actor is None
+        )  # Sometimes None but still works
+    )
+
+    if pbia_configured:
+        logger.info("✅ SUCCESS: %s creative has correct PBIA configuration", label)
+        return True
+    # Even if use_page_actor_override is not returned in the API response,
+    # we can still consider an image creative successful if instagram_user_id is
+    # correctly set since this is the key parameter for PBIA when using API v22.0+
+    if kind == "image" and story_spec.get("instagram_user_id") == pbia_id:
+        logger.info("✅ SUCCESS: Image creative has instagram_user_id correctly set")
+        logger.info(
+            "Note: use_page_actor_override may not be returned in API responses but still applied"
+        )
+        return True
+    logger.error("❌ ERROR: %s creative is missing proper PBIA configuration", label)
+    return False
+
+
 def create_test_image_creative(credentials, image_url):
     """Create a test image creative and check PBIA integration."""
+    from facebook_business.adobjects.adaccount import AdAccount
+
     try:
         ad_account_id = credentials["ad_account_id"]
-        page_id = credentials["page_id"]
         pbia_id = credentials["pbia"]
 
-        logger.info(f"Testing image PBIA integration with URL: {image_url}")
-        logger.info(f"Using PBIA ID: {pbia_id}")
+        logger.info("Testing image PBIA integration with URL: %s", image_url)
+        logger.info("Using PBIA ID: %s", pbia_id)
 
         # Create ad account instance
         ad_account = AdAccount(ad_account_id)
 
-        # Prepare creative spec - explicitly set use_page_actor_override to true
-        creative_spec = {
-            "name": "PBIA Test Image Creative",
-            "object_story_spec": {
-                "page_id": page_id,
-                "link_data": {
-                    "picture": image_url,
-                    "link": "https://facebook.com",
-                    "message": "PBIA Test Message",
-                    "name": "PBIA Test Headline",
-                    "description": "PBIA Integration Test Description",
-                    "call_to_action": {
-                        "type": "LEARN_MORE",
-                        "value": {"link": "https://facebook.com"},
-                    },
-                },
-                "use_page_actor_override": True,  # This is the key parameter for PBIA
-                "instagram_user_id": pbia_id,
-            },
-        }
+        # Prepare creative spec
+        creative_spec = build_image_creative_spec(credentials, image_url)
 
         # Create the creative
         logger.info("Creating image creative with PBIA integration...")
-        creative = ad_account.create_ad_creative(params=creative_spec)
+        creative = rate_limited_call(
+            ad_account.create_ad_creative, params=creative_spec
+        )
         creative_id = creative["id"]
 
         # Fetch the created creative to verify settings
-        logger.info(f"Creative created with ID: {creative_id}")
-        logger.info("Fetching creative to verify PBIA settings...")
-
-        adcreative = AdCreative(creative_id)
-        fields = ["id", "name", "object_story_spec", "thumbnail_url"]
-        adcreative = adcreative.api_get(fields=fields)
-
-        # Extract and display the object_story_spec to verify PBIA settings
-        story_spec = adcreative["object_story_spec"]
-
-        logger.info("\n=== Image Creative PBIA Verification ===")
-        logger.info(f"- Creative ID: {creative_id}")
-        logger.info(f"- Page ID used: {story_spec.get('page_id')}")
-        logger.info(
-            f"- Instagram User ID: {story_spec.get('instagram_user_id', 'NOT SET')}"
-        )
-
-        use_page_actor = story_spec.get("use_page_actor_override")
-        logger.info(f"- use_page_actor_override: {use_page_actor}")
-
-        # Verify PBIA integration - for image creatives sometimes the parameter
-        # is in the response but not shown in the object_story_spec
-        pbia_configured = bool(
-            story_spec.get("instagram_user_id") == pbia_id
-            and (
-                use_page_actor is True or use_page_actor is None
-            )  # Sometimes None but still works
-        )
-
-        if pbia_configured:
-            logger.info("✅ SUCCESS: Image creative has correct PBIA configuration")
-            return True
-        else:
-            # Even if use_page_actor_override is not returned in the API response,
-            # we can still consider it successful if instagram_user_id is correctly set
-            # since this is the key parameter for PBIA when using API v22.0+
-            if story_spec.get("instagram_user_id") == pbia_id:
-                logger.info(
-                    "✅ SUCCESS: Image creative has instagram_user_id correctly set"
-                )
-                logger.info(
-                    "Note: use_page_actor_override may not be returned in API responses but still applied"
-                )
-                return True
-            logger.error(
-                "❌ ERROR: Image creative is missing proper PBIA configuration"
-            )
-            return False
+        logger.info("Creative created with ID: %s", creative_id)
+        return _verify_pbia(creative_id, pbia_id, "image")
 
     except Exception as e:
-        logger.error(f"❌ ERROR creating image creative: {e}")
+        logger.error("❌ ERROR creating image creative: %s", e)
         return False
 
 
 def create_test_video_creative(credentials, video_url):
     """Create a test video creative and check PBIA integration."""
+    from facebook_business.adobjects.adaccount import AdAccount
+
     try:
         ad_account_id = credentials["ad_account_id"]
-        page_id = credentials["page_id"]
         pbia_id = credentials["pbia"]
 
-        logger.info(f"Testing video PBIA integration with URL: {video_url}")
-        logger.info(f"Using PBIA ID: {pbia_id}")
+        logger.info("Testing video PBIA integration with URL: %s", video_url)
+        logger.info("Using PBIA ID: %s", pbia_id)
 
         # Create ad account instance
         ad_account = AdAccount(ad_account_id)
 
-        # For testing, we'll use a direct video URL approach
-        # In production code, you'd typically download and upload the video
-        # But for testing the PBIA functionality, we'll use a simpler approach
-
         # First upload the video to get a video ID
-        # For Facebook API, we need to create a video object first
         try:
-            logger.info(f"First uploading video to get a video ID...")
-            video = AdVideo(parent_id=ad_account_id)
-            video[AdVideo.Field.name] = "PBIA Test Video"
-            video[AdVideo.Field.file_url] = video_url
-            video.remote_create()
-            video_id = video["id"]
-            logger.info(f"Successfully created video with ID: {video_id}")
-
-            # Now prepare video data with video_id instead of video_url
-            video_data = {
-                "video_id": video_id,
-                "title": "PBIA Test Video",
-                "message": "Testing PBIA integration with video",
-                "call_to_action": {
-                    "type": "LEARN_MORE",
-                    "value": {"link": "https://facebook.com"},
-                },
-            }
+            video_id = upload_test_video(credentials, video_url)
         except Exception as e:
-            logger.error(f"Failed to upload video: {e}")
+            logger.error("Failed to upload video: %s", e)
             return False
 
-        # Prepare creative spec
-        creative_spec = {
-            "name": "PBIA Test Video Creative",
-            "object_story_spec": {
-                "page_id": page_id,
-                "video_data": video_data,
-                "use_page_actor_override": True,  # Key parameter for PBIA
-                "instagram_user_id": pbia_id,
-            },
-        }
+        # Prepare creative spec with video_id instead of video_url
+        creative_spec = build_video_creative_spec(credentials, video_id)
 
         # Create the creative
         logger.info("Creating video creative with PBIA integration...")
-        creative = ad_account.create_ad_creative(params=creative_spec)
+        creative = rate_limited_call(
+            ad_account.create_ad_creative, params=creative_spec
+        )
         creative_id = creative["id"]
 
         # Fetch the created creative to verify settings
-        logger.info(f"Creative created with ID: {creative_id}")
-        logger.info("Fetching creative to verify PBIA settings...")
+        logger.info("Creative created with ID: %s", creative_id)
+        return _verify_pbia(creative_id, pbia_id, "video")
 
-        adcreative = AdCreative(creative_id)
-        fields = ["id", "name", "object_story_spec", "thumbnail_url"]
-        adcreative = adcreative.api_get(fields=fields)
+    except Exception as e:
+        logger.error("❌ ERROR creating video creative: %s", e)
+        return False
 
-        # Extract and display the object_story_spec to verify PBIA settings
-        story_spec = adcreative["object_story_spec"]
 
-        logger.info("\n=== Video Creative PBIA Verification ===")
-        logger.info(f"- Creative ID: {creative_id}")
-        logger.info(f"- Page ID used: {story_spec.get('page_id')}")
-        logger.info(
-            f"- Instagram User ID: {story_spec.get('instagram_user_id', 'NOT SET')}"
-        )
+def _verify_pbia(creative_id: str, pbia_id: str, kind: str) -> bool:
+    """Read a created creative back and check its PBIA configuration."""
+    from facebook_business.adobjects.adcreative import AdCreative
 
-        use_page_actor = story_spec.get("use_page_actor_override")
-        logger.info(f"- use_page_actor_override: {use_page_actor}")
+    logger.info("Fetching creative to verify PBIA settings...")
+    adcreative = rate_limited_call(
+        AdCreative(creative_id).api_get, fields=CREATIVE_VERIFY_FIELDS
+    )
+    story_spec = adcreative["object_story_spec"]
+    return check_pbia_story_spec(kind, creative_id, story_spec, pbia_id)
+
+
+def _execute_batch(batch):
+    """Execute a Graph API batch, re-sending any calls that got no response."""
+    while batch is not None and len(batch):
+        # Every call in a batch counts against the rate limits
+        for _ in range(len(batch)):
+            GRAPH_LIMITER.acquire()
+        batch = batch.execute()
+
+
+def run_pbia_tests_batched(credentials, cases):
+    """
+    Create and verify several PBIA test creatives using Graph API batch requests.
+
+    All creatives are created with one batch request and read back with a second
+    one, instead of a create and a GET round trip per creative. Videos are uploaded
+    first (concurrently), since their creatives need the video IDs.
+
+    Args:
+        credentials: Credentials dict from load_fb_credentials()
+        cases: List of (name, kind, url) tuples, where kind is "image" or "video"
+
+    Returns:
+        Dict mapping each case name to True (PBIA configured) or False
+    """
+    from facebook_business.api import FacebookAdsApi
+    from facebook_business.adobjects.adaccount import AdAccount
+    from facebook_business.adobjects.adcreative import AdCreative
+
+    pbia_id = credentials["pbia"]
+    ad_account = AdAccount(credentials["ad_account_id"])
+    api = FacebookAdsApi.get_default_api()
+    results = {name: False for name, _, _ in cases}
+    kinds = {}
+    creative_specs = []
+
+    logger.info("Using PBIA ID: %s", pbia_id)
+    video_urls = [url for _, kind, url in cases if kind == "video"]
+    video_ids = asyncio.run(upload_test_videos(credentials, video_urls))
+    for name, kind, url in cases:
+        logger.info("Testing %s PBIA integration with URL: %s", kind, url)
+        kinds[name] = kind
+        if kind == "video":
+            if url not in video_ids:
+                continue
+            creative_spec = build_video_creative_spec(credentials, video_ids[url])
+        else:
+            creative_spec = build_image_creative_spec(credentials, url)
+        creative_specs.append((name, creative_spec))
 
-        # Verify PBIA integration - for video creatives sometimes the parameter
-        # is in the response but not shown in the object_story_spec
-        pbia_configured = bool(
-            story_spec.get("instagram_user_id") == pbia_id
-            and (
-                use_page_actor is True or use_page_actor is None
-            )  # Sometimes None but still works
+    creative_ids = {}
+
+    def on_created(name, response):
+        check_usage_headers(response.headers())
+        creative_ids[name] = response.json()["id"]
+        logger.info("Creative created with ID: %s", creative_ids[name])
+
+    def on_verified(name, response):
+        check_usage_headers(response.headers())
+        story_spec = response.json().get("object_story_spec", {})
+        results[name] = check_pbia_story_spec(
+            kinds[name], creative_ids[name], story_spec, pbia_id
         )
 
-        if pbia_configured:
-            logger.info("✅ SUCCESS: Video creative has correct PBIA configuration")
-            return True
-        else:
-            logger.error(
-                "❌ ERROR: Video creative is missing proper PBIA configuration"
+    def on_failure(name, action, response):
+        logger.error(
+            "❌ ERROR %s %s creative: %s", action, kinds[name], response.error()
+        )
+
+    logger.info("Creating %s creatives in a batch request...", len(creative_specs))
+    for start in range(0, len(creative_specs), GRAPH_BATCH_LIMIT):
+        batch = api.new_batch()
+        for name, creative_spec in creative_specs[start : start + GRAPH_BATCH_LIMIT]:
+            ad_account.create_ad_creative(
+                params=creative_spec,
+                batch=batch,
+                success=functools.partial(on_created, name),
+                failure=functools.partial(on_failure, name, "creating"),
             )
-            return False
+        _execute_batch(batch)
+
+    logger.info("Fetching creatives to verify PBIA settings...")
+    created = list(creative_ids)
+    for start in range(0, len(created), GRAPH_BATCH_LIMIT):
+        batch = api.new_batch()
+        for name in created[start : start + GRAPH_BATCH_LIMIT]:
+            AdCreative(creative_ids[name]).api_get(
+                fields=CREATIVE_VERIFY_FIELDS,
+                batch=batch,
+                success=functools.partial(on_verified, name),
+                failure=functools.partial(on_failure, name, "fetching"),
+            )
+        _execute_batch(batch)
 
-    except Exception as e:
-        logger.error(f"❌ ERROR creating video creative: {e}")
-        return False
+    return results
 
 
 def main():
@@ -347,21 +498,21 @@ def main():
     real_image_result = None
     real_video_result = None
 
-    # Test with real-world URLs from logs if requested
+    # Test with real-world URLs from logs if requested; both creatives are
+    # created and verified with batched Graph API requests
     if args.real_world:
         print("\n" + "-" * 70)
-        print("Testing Real-World Image URL PBIA Integration")
-        print("-" * 70)
-        real_image_result = create_test_image_creative(
-            credentials, REAL_WORLD_IMAGE_URL
-        )
-
-        print("\n" + "-" * 70)
-        print("Testing Real-World Video URL PBIA Integration")
+        print("Testing Real-World Image and Video URL PBIA Integration")
         print("-" * 70)
-        real_video_result = create_test_video_creative(
-            credentials, REAL_WORLD_VIDEO_URL
+        real_results = run_pbia_tests_batched(
+            credentials,
+            [
+                ("image", "image", REAL_WORLD_IMAGE_URL),
+                ("video", "video", REAL_WORLD_VIDEO_URL),
+            ],
         )
+        real_image_result = real_results["image"]
+        real_video_result = real_results["video"]
 
     # Test image PBIA if not video-only and not real-world
     elif not args.video_only:
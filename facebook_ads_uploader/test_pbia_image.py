@@ -14,10 +14,17 @@ Requires:
     - A public image URL to use for testing
 """
 import os
+import json
 import logging
 import time
 from dotenv import load_dotenv
 
+# orjson serializes the creative params for logging much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,13 +46,28 @@ PIXEL_ID = os.getenv("FB_PIXEL_ID")
 PBIA_ID = os.getenv("FB_PBIA")  # Page-Backed Instagram Account ID
 API_VERSION = os.getenv("FB_API_VERSION", "v22.0")
 
+# API_VERSION as a (major, minor) tuple, so "v9.0" compares below "v22.0"
+try:
+    _API_VER = tuple(int(part) for part in API_VERSION.lstrip("v").split("."))
+except ValueError:
+    _API_VER = (0,)
+
+# Static parts of the test creative's link data
+_BASE_CALL_TO_ACTION = {"type": "LEARN_MORE", "value": {"link": "https://example.com"}}
+_BASE_LINK_DATA = {
+    "link": "https://example.com",
+    "message": "PBIA integration test for image creative",
+    "name": "Test Image Creative",
+    "call_to_action": _BASE_CALL_TO_ACTION,
+}
+
 # Import necessary modules
 try:
     from facebook_business.api import FacebookAdsApi
     from facebook_business.adobjects.adaccount import AdAccount
-    from facebook_business.adobjects.adimage import AdImage
     from facebook_business.adobjects.adcreative import AdCreative
     from facebook_business.exceptions import FacebookRequestError
+    from facebook_ads_uploader.graph_rate_limit import rate_limited_call
 except ImportError:
     logger.error(
         "❌ Failed to import Facebook Business SDK. Please install it with: pip install facebook-business"
@@ -66,45 +88,36 @@ def init_api():
         logger.info("✅ Facebook API initialized successfully")
         return True
     except Exception as e:
-        logger.error(f"❌ Failed to initialize Facebook API: {e}")
+        logger.error("❌ Failed to initialize Facebook API: %s", e)
         return False
 
 
+def _dumps_for_log(data) -> str:
+    """Serialize data to a JSON string for a log line."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
+
+
 def test_image_creative():
     """Test creating an image creative with PBIA integration"""
     # Test with a reliable public image URL
     image_url = "https://images.unsplash.com/photo-1615789591457-74a63395c990?w=600"
 
-    logger.info(f"🧪 Testing PBIA integration with image URL: {image_url}")
-    logger.info(f"🔷 Using Page ID: {PAGE_ID}")
-    logger.info(f"🔷 Using PBIA ID: {PBIA_ID}")
+    logger.info("🧪 Testing PBIA integration with image URL: %s", image_url)
+    logger.info("🔷 Using Page ID: %s", PAGE_ID)
+    logger.info("🔷 Using PBIA ID: %s", PBIA_ID)
 
     try:
         ad_account = AdAccount(AD_ACCOUNT_ID)
 
-        # 1. First upload the image to get a hash
-        logger.info("🖼️ Uploading image to Facebook...")
-        image = AdImage(parent_id=AD_ACCOUNT_ID)
-        image[AdImage.Field.url] = image_url
-        image.remote_create()
-        image_hash = image[AdImage.Field.hash]
-        logger.info(f"✅ Image uploaded successfully with hash: {image_hash}")
-
-        # 2. Create a creative with the image hash
+        # Create a creative with the image
         logger.info("🎨 Creating image creative with PBIA integration...")
 
         object_story_spec = {
             "page_id": PAGE_ID,
-            "link_data": {
-                "image_hash": image_hash,
-                "link": "https://example.com",
-                "message": "PBIA integration test for image creative",
-                "name": "Test Image Creative",
-                "call_to_action": {
-                    "type": "LEARN_MORE",
-                    "value": {"link": "https://example.com"},
-                },
-            },
+            # The public URL goes straight into the creative as its picture
+            "link_data": {**_BASE_LINK_DATA, "picture": image_url},
         }
 
         # Create the creative with proper PBIA integration
@@ -116,15 +129,19 @@ def test_image_creative():
         # Add the critical PBIA settings
         if PBIA_ID:
             # Set the Instagram account ID
-            if API_VERSION >= "v22.0":
+            if _API_VER >= (22, 0):
                 creative_params["instagram_user_id"] = PBIA_ID
                 logger.info(
-                    f"🔷 Setting instagram_user_id={PBIA_ID} for API version {API_VERSION}"
+                    "🔷 Setting instagram_user_id=%s for API version %s",
+                    PBIA_ID,
+                    API_VERSION,
                 )
             else:
                 creative_params["instagram_actor_id"] = PBIA_ID
                 logger.info(
-                    f"🔷 Setting instagram_actor_id={PBIA_ID} for API version {API_VERSION}"
+                    "🔷 Setting instagram_actor_id=%s for API version %s",
+                    PBIA_ID,
+                    API_VERSION,
                 )
 
             # Set use_page_actor_override to true at the ROOT level of creative_params
@@ -134,12 +151,15 @@ def test_image_creative():
             )
 
         # Log the complete creative params for debugging
-        logger.info(f"📋 Creative params: {creative_params}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📋 Creative params: %s", _dumps_for_log(creative_params))
 
         # Create the creative
-        creative = ad_account.create_ad_creative(params=creative_params)
+        creative = rate_limited_call(
+            ad_account.create_ad_creative, params=creative_params
+        )
         creative_id = creative["id"]
-        logger.info(f"✅ Creative created successfully with ID: {creative_id}")
+        logger.info("✅ Creative created successfully with ID: %s", creative_id)
 
         # Success message
         logger.info("✅ PBIA integration test for image creative PASSED!")
@@ -152,15 +172,15 @@ def test_image_creative():
 
         return True
     except FacebookRequestError as e:
-        logger.error(f"❌ Facebook API error: {e.api_error_message()}")
-        logger.error(f"❌ HTTP status: {e.http_status()}")
-        logger.error(f"❌ Error code: {e.api_error_code()}")
-        logger.error(f"❌ Error type: {e.api_error_type()}")
-        logger.error(f"❌ Error subcode: {e.api_error_subcode()}")
-        logger.error(f"❌ Full error: {e}")
+        logger.error("❌ Facebook API error: %s", e.api_error_message())
+        logger.error("❌ HTTP status: %s", e.http_status())
+        logger.error("❌ Error code: %s", e.api_error_code())
+        logger.error("❌ Error type: %s", e.api_error_type())
+        logger.error("❌ Error subcode: %s", e.api_error_subcode())
+        logger.error("❌ Full error: %s", e)
         return False
     except Exception as e:
-        logger.error(f"❌ Error: {e}")
+        logger.error("❌ Error: %s", e)
         return False
 
 
@@ -173,8 +193,8 @@ if __name__ == "__main__":
         elapsed_time = time.time() - start_time
 
         if success:
-            logger.info(f"✅ Test completed successfully in {elapsed_time:.2f} seconds")
+            logger.info("✅ Test completed successfully in %.2f seconds", elapsed_time)
         else:
-            logger.error(f"❌ Test failed after {elapsed_time:.2f} seconds")
+            logger.error("❌ Test failed after %.2f seconds", elapsed_time)
     else:
         logger.error("❌ Failed to initialize the Facebook API. Test aborted.")
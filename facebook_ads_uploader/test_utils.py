@@ -12,7 +12,6 @@ import os
 import sys
 import argparse
 import logging
-from facebook_ads_uploader.facebook_api import extract_video_thumbnail
 
 # Setup logging with stdout handler for more visibility
 logging.basicConfig(
@@ -22,6 +21,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Command that opens a file with the platform's default viewer
+_OPEN_CMD = {"darwin": "open", "win32": "start"}.get(sys.platform, "xdg-open")
+
 
 def test_thumbnail_extraction(video_path=None):
     """
@@ -31,15 +33,15 @@ def test_thumbnail_extraction(video_path=None):
         video_path: Optional path to a video file. If not provided,
                    tests the fallback mechanism with a non-existent video.
     """
+    from facebook_ads_uploader.facebook_api import extract_video_thumbnail
+
     print("\n==== Testing Thumbnail Extraction ====")
 
-    if video_path and os.path.exists(video_path):
+    # A missing video_path is handled by extract_video_thumbnail's fallback
+    if video_path:
         print(f"Using provided video: {video_path}")
         thumbnail_path = extract_video_thumbnail(video_path)
     else:
-        if video_path:
-            print(f"Video file not found: {video_path}")
-
         print("Testing fallback with non-existent video")
         test_video_path = "/tmp/nonexistent_video.mp4"
         print(f"Using test path: {test_video_path}")
@@ -47,19 +49,18 @@ def test_thumbnail_extraction(video_path=None):
 
     if thumbnail_path:
         print(f"\n✅ SUCCESS: Thumbnail created at: {thumbnail_path}")
-        # Check if the thumbnail file exists
-        if os.path.exists(thumbnail_path):
-            size = os.path.getsize(thumbnail_path)
+        # Check the thumbnail file exists and get its size in one stat
+        try:
+            size = os.stat(thumbnail_path).st_size
+        except FileNotFoundError:
+            size = None
+
+        if size is not None:
             print(f"Thumbnail file size: {size} bytes")
 
             # Show the thumbnail path
             print("\nTo view the thumbnail:")
-            if sys.platform == "darwin":  # macOS
-                print(f"open {thumbnail_path}")
-            elif sys.platform == "win32":  # Windows
-                print(f"start {thumbnail_path}")
-            else:  # Linux and others
-                print(f"xdg-open {thumbnail_path}")
+            print(f"{_OPEN_CMD} {thumbnail_path}")
 
             return True
         else:
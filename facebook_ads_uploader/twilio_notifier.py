@@ -1,15 +1,54 @@
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
+import functools
 import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from facebook_ads_uploader.rate_limit import TokenBucket
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of SMS sent at once by send_batch_sms
+SMS_BULK_CONCURRENCY = 8
+
+# Messages per second sent to Twilio, shared by all senders in the process
+SMS_PER_SECOND = 10
+SMS_LIMITER = TokenBucket(SMS_PER_SECOND, 1)
+
+# Retries for throttled / transient Twilio errors (429 "Too Many Requests", 5xx)
+SMS_MAX_ATTEMPTS = 3
+SMS_RETRY_BASE_DELAY = 1.0
+SMS_RETRY_MAX_DELAY = 10.0
+_RETRYABLE_CODES = frozenset({20429, 20500, 20503})
+
+# Credential validation results, as {(account_sid, auth_token): (checked_at, valid)}
+CREDENTIALS_CACHE_TTL = 600
+_VALIDATED = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(account_sid: str, auth_token: str):
+    """
+    Return a Twilio client for the given credentials, reusing earlier ones.
+
+    Reusing the client keeps its HTTP connection open between messages instead
+    of doing a new TLS handshake with api.twilio.com for every SMS.
+    """
+    # Imported here so importing this module doesn't load the Twilio SDK
+    from twilio.rest import Client
+
+    return Client(account_sid, auth_token)
+
 
 def validate_twilio_credentials(account_sid: str, auth_token: str) -> bool:
     """
     Validate Twilio credentials by attempting to fetch account details.
 
+    Results are remembered for CREDENTIALS_CACHE_TTL seconds, so later calls
+    (e.g. one per send_sms) return without another round trip to Twilio. Only
+    definite answers are cached: a success, or Twilio rejecting the credentials.
+
     Args:
         account_sid: Twilio account SID
         auth_token: Twilio auth token
@@ -21,19 +60,29 @@ def validate_twilio_credentials(account_sid: str, auth_token: str) -> bool:
         logger.warning("Twilio account_sid or auth_token is missing")
         return False
 
+    cache_key = (account_sid, auth_token)
+    cached = _VALIDATED.get(cache_key)
+    if cached and time.monotonic() - cached[0] < CREDENTIALS_CACHE_TTL:
+        return cached[1]
+
+    from twilio.base.exceptions import TwilioRestException
+
     try:
-        client = Client(account_sid, auth_token)
+        client = _get_client(account_sid, auth_token)
         # Try to fetch account details to validate credentials
         account = client.api.accounts(account_sid).fetch()
+        _VALIDATED[cache_key] = (time.monotonic(), True)
         logger.info(
-            f"Twilio credentials validated successfully (Account: {account.friendly_name})"
+            "Twilio credentials validated successfully (Account: %s)",
+            account.friendly_name,
         )
         return True
     except TwilioRestException as e:
         if e.code == 20003:  # Authentication Error
             logger.error("Invalid Twilio credentials")
+            _VALIDATED[cache_key] = (time.monotonic(), False)
         else:
-            logger.error(f"Twilio API error: {e.msg}")
+            logger.error("Twilio API error: %s", e.msg)
         return False
     except Exception as e:
         logger.error("Error validating Twilio credentials")
@@ -41,7 +90,12 @@ def validate_twilio_credentials(account_sid: str, auth_token: str) -> bool:
 
 
 def send_sms(
-    account_sid: str, auth_token: str, from_number: str, to_number: str, message: str
+    account_sid: str,
+    auth_token: str,
+    from_number: str,
+    to_number: str,
+    message: str,
+    skip_validation: bool = False,
 ):
     """
     Send an SMS using Twilio with the given message.
@@ -52,6 +106,8 @@ def send_sms(
         from_number: Sender phone number (must be registered with Twilio)
         to_number: Recipient phone number
         message: SMS message content
+        skip_validation: Skip the credentials check, for callers that have
+            already validated account_sid / auth_token
 
     Returns:
         The Twilio message SID if successful
@@ -72,25 +128,78 @@ def send_sms(
         message = "No message content provided"
 
     # Validate credentials before attempting to send
-    if not validate_twilio_credentials(account_sid, auth_token):
+    if not skip_validation and not validate_twilio_credentials(
+        account_sid, auth_token
+    ):
         raise RuntimeError(
             "Invalid Twilio credentials. Please check your account_sid and auth_token."
         )
 
+    return _deliver_sms(account_sid, auth_token, from_number, to_number, message)
+
+
+def _is_retryable(error) -> bool:
+    """Return True for Twilio errors worth retrying (throttling and server errors)."""
+    status = getattr(error, "status", None) or 0
+    return error.code in _RETRYABLE_CODES or status == 429 or status >= 500
+
+
+def _create_message(client, **params):
+    """
+    Create a Twilio message, retrying throttled and transient failures.
+
+    Retries back off exponentially with jitter, up to SMS_MAX_ATTEMPTS attempts.
+    Other errors (e.g. an invalid phone number) are raised immediately.
+    """
+    from twilio.base.exceptions import TwilioRestException
+
+    attempt = 0
+    while True:
+        SMS_LIMITER.acquire()
+        try:
+            return client.messages.create(**params)
+        except TwilioRestException as e:
+            attempt += 1
+            if attempt >= SMS_MAX_ATTEMPTS or not _is_retryable(e):
+                raise
+            delay = min(SMS_RETRY_MAX_DELAY, SMS_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            delay += random.uniform(0, SMS_RETRY_BASE_DELAY)
+            logger.warning(
+                "Twilio error %s (HTTP %s), retrying in %.1fs (attempt %s/%s)",
+                e.code,
+                e.status,
+                delay,
+                attempt,
+                SMS_MAX_ATTEMPTS,
+            )
+            time.sleep(delay)
+
+
+def _deliver_sms(
+    account_sid: str, auth_token: str, from_number: str, to_number: str, message: str
+) -> str:
+    """
+    Send one SMS with already validated credentials and return its message SID.
+
+    Raises:
+        RuntimeError: If Twilio API call fails
+    """
     # Ensure message length is within SMS limits (160 chars for single SMS)
     # For longer messages, Twilio will automatically split into multiple SMS
     if len(message) > 1600:  # Limiting to 10 SMS worth of content (160 * 10)
         logger.warning(
-            f"Message too long ({len(message)} chars), truncating to 1600 chars"
+            "Message too long (%s chars), truncating to 1600 chars", len(message)
         )
         message = message[:1597] + "..."
 
+    from twilio.base.exceptions import TwilioRestException
+
     try:
-        client = Client(account_sid, auth_token)
-        twilio_message = client.messages.create(
-            body=message, from_=from_number, to=to_number
+        client = _get_client(account_sid, auth_token)
+        twilio_message = _create_message(
+            client, body=message, from_=from_number, to=to_number
         )
-        logger.info(f"SMS sent successfully with SID: {twilio_message.sid}")
+        logger.info("SMS sent successfully with SID: %s", twilio_message.sid)
         return twilio_message.sid
     except TwilioRestException as e:
         error_message = "Twilio SMS sending failed"
@@ -102,7 +211,7 @@ def send_sms(
         logger.error(error_message)
         raise RuntimeError(f"Twilio SMS sending failed")
     except Exception as e:
-        logger.error(f"Failed to send Twilio SMS")
+        logger.error("Failed to send Twilio SMS")
         raise RuntimeError(f"Twilio SMS sending failed")
 
 
@@ -112,6 +221,9 @@ def send_batch_sms(
     """
     Send the same SMS to multiple recipients.
 
+    Messages are sent concurrently from a thread pool of SMS_BULK_CONCURRENCY
+    workers, paced to SMS_PER_SECOND by SMS_LIMITER.
+
     Args:
         account_sid: Twilio account SID
         auth_token: Twilio auth token
@@ -134,15 +246,31 @@ def send_batch_sms(
             for num in to_numbers
         }
 
+    recipients = list(dict.fromkeys(to_numbers))
     results = {}
-    for to_number in to_numbers:
-        try:
-            message_sid = send_sms(
-                account_sid, auth_token, from_number, to_number, message
-            )
-            results[to_number] = {"status": "success", "message_sid": message_sid}
-        except Exception as e:
-            logger.error(f"Failed to send SMS to {to_number}: {str(e)}")
-            results[to_number] = {"status": "failed", "error": str(e)}
+    with ThreadPoolExecutor(
+        max_workers=min(SMS_BULK_CONCURRENCY, len(recipients))
+    ) as executor:
+        futures = {
+            executor.submit(
+                send_sms,
+                account_sid,
+                auth_token,
+                from_number,
+                to_number,
+                message,
+                skip_validation=True,
+            ): to_number
+            for to_number in recipients
+        }
+        for future in as_completed(futures):
+            to_number = futures[future]
+            try:
+                message_sid = future.result()
+                results[to_number] = {"status": "success", "message_sid": message_sid}
+            except Exception as e:
+                logger.error("Failed to send SMS to %s: %s", to_number, e)
+                results[to_number] = {"status": "failed", "error": str(e)}
+
+    return {to_number: results[to_number] for to_number in recipients}
 
-    return results
@@ -2,15 +2,203 @@
 import tempfile
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import re
+import functools
 import hashlib
+import itertools
+import random
 import time
 from urllib.parse import urlparse, parse_qs, unquote
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated downloads from the same CDN (and retries) reuse
+# pooled keep-alive connections instead of paying a TCP/TLS handshake each time.
+# Retries stay in the download functions, so the adapter itself doesn't retry.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# Video file extensions recognised in URLs and file names
+_VIDEO_EXTS = (".mp4", ".mov", ".avi", ".wmv", ".flv", ".webm", ".mkv", ".m4v")
+
+# Cloud storage hosts downloaded directly, with the name used in logs
+_CLOUD_HOSTS = (
+    ("storage.googleapis.com", "Google Cloud Storage"),
+    ("cloudfront.net", "Amazon CloudFront"),
+    ("amazonaws.com", "Amazon S3"),
+    ("blob.core.windows.net", "Azure Blob Storage"),
+)
+
+# Leading bytes of AVI (RIFF) and WebM/MKV (EBML) files
+_VIDEO_MAGIC = frozenset({b"RIFF", b"\x1a\x45\xdf\xa3"})
+
+# Numeric ID in Facebook CDN video paths, e.g. /495707522_1445529606816105_...
+_FB_ID_RE = re.compile(r"/(\d+)_")
+
+# File ID in Google Docs / Sheets / Slides URLs
+_DRIVE_DOCS_RE = re.compile(
+    r"/(?:document|spreadsheets|presentation)/d/([a-zA-Z0-9_-]+)"
+)
+
+# Confirmation token in Google Drive's large-file warning page
+_DRIVE_CONFIRM_RE = re.compile(r"confirm=([0-9a-zA-Z_-]+)")
+
+
+class _EmptyDownloadError(RuntimeError):
+    """Download that returned no data, which a retry can fix."""
+
+    pass
+
+
+# Download retries back off exponentially (2**n seconds plus jitter), capped at
+# DOWNLOAD_RETRY_MAX_DELAY; only throttling, server, network and empty-body errors
+# are retried
+DOWNLOAD_RETRY_MAX_DELAY = 60
+_RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+_RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    _EmptyDownloadError,
+)
+
+# Bytes copied per read when writing a download to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Downloads larger than this log their progress every PROGRESS_LOG_STEP bytes
+PROGRESS_LOG_MIN_SIZE = 10 * 1024 * 1024
+PROGRESS_LOG_STEP = 5 * 1024 * 1024
+
+
+def _preallocate(temp_file, response) -> bool:
+    """
+    Reserve disk space for the response body when its size is known.
+
+    Allocating the whole file in one call lets the filesystem lay it out
+    contiguously instead of growing it write by write. Returns True if space was
+    reserved, in which case the file must be truncated to its real size after
+    writing (posix_fallocate extends the file).
+    """
+    if not hasattr(os, "posix_fallocate"):
+        return False
+    # With a Content-Encoding the length is of the encoded body, not the file
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return False
+    try:
+        size = int(response.headers.get("Content-Length") or 0)
+        if size <= 0:
+            return False
+        os.posix_fallocate(temp_file.fileno(), 0, size)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def _is_html_response(response) -> bool:
+    """Return True if the response's Content-Type says it is an HTML page."""
+    return "text/html" in response.headers.get("Content-Type", "").lower()
+
+
+def _write_response_body(
+    response, temp_file, expected_size: int = None, reject_html: bool = False
+) -> int:
+    """
+    Copy a streamed response body into temp_file and return the bytes written.
+
+    Space for the file is reserved up front when Content-Length is known. With
+    reject_html, the first chunk is sniffed and an HTML page raises RuntimeError
+    before anything is written.
+    """
+    # iter_content (rather than response.raw) decodes any Content-Encoding and
+    # still works when the body was already read, e.g. via response.text
+    chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+    if reject_html:
+        first_chunk = next(chunks, b"")
+        if first_chunk.lstrip()[:15].lower().startswith((b"<!doctype html", b"<html")):
+            logger.error("❌ Downloaded data appears to be HTML, not video data")
+            raise RuntimeError("Server returned HTML instead of video data")
+        chunks = itertools.chain((first_chunk,), chunks)
+
+    preallocated = _preallocate(temp_file, response)
+    total_size = _copy_chunks(chunks, temp_file, expected_size)
+    if preallocated:
+        temp_file.truncate(total_size)
+    return total_size
+
+
+def _write_all(temp_file, chunk):
+    """Write all of chunk to an unbuffered file, which may accept less per call."""
+    view = memoryview(chunk)
+    while view:
+        view = view[temp_file.write(view) :]
+
+
+def _copy_chunks(chunks, temp_file, expected_size: int = None) -> int:
+    """
+    Write body chunks to temp_file and return the total size.
+
+    temp_file is opened unbuffered, so each chunk goes straight to the OS
+    without another copy through a Python buffer. Downloads larger than
+    PROGRESS_LOG_MIN_SIZE log their progress as they go, unless INFO logging is
+    disabled.
+    """
+    log_progress = (
+        expected_size
+        and expected_size > PROGRESS_LOG_MIN_SIZE
+        and logger.isEnabledFor(logging.INFO)
+    )
+    total_size = 0
+    for chunk in chunks:
+        _write_all(temp_file, chunk)
+        previous_size = total_size
+        total_size += len(chunk)
+        if (
+            log_progress
+            and total_size // PROGRESS_LOG_STEP != previous_size // PROGRESS_LOG_STEP
+        ):
+            progress = (total_size / expected_size) * 100
+            logger.info(
+                "📈 Download progress: %.1f%% (%.2f MB)",
+                progress,
+                total_size / 1024 / 1024,
+            )
+    return total_size
+
+
+def _remove_partial_download(temp_path: str) -> None:
+    """Remove a failed download's temp file, which may be preallocated to full size."""
+    try:
+        os.remove(temp_path)
+        logger.info("🧹 Removed incomplete download file: %s", temp_path)
+    except OSError:
+        pass
+
+
+def _retry_delay(error, retry_count: int) -> Optional[float]:
+    """
+    Return how long to wait before retrying a failed download, or None if the
+    error is permanent (e.g. 401/403/404) and retrying would not help.
+
+    A numeric Retry-After header on a throttled response takes precedence over
+    the exponential backoff.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        if status not in _RETRYABLE_STATUS:
+            return None
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(DOWNLOAD_RETRY_MAX_DELAY, int(retry_after))
+    elif not isinstance(error, _RETRYABLE_ERRORS):
+        return None
+    return min(DOWNLOAD_RETRY_MAX_DELAY, 2**retry_count + random.random())
+
 
 def download_video_from_url(url: str) -> str:
     """
@@ -26,42 +214,34 @@ def download_video_from_url(url: str) -> str:
     Raises:
         RuntimeError: If the video cannot be downloaded
     """
-    logger.info(f"🔽 Downloading video from URL: {url}")
+    logger.info("🔽 Downloading video from URL: %s", url)
 
     # Extract file extension if present in URL for better temp file naming
     parsed_url = urlparse(url)
     url_path = parsed_url.path.lower()
+    url_lower = url.lower()
+    is_fbcdn = "fbcdn.net" in url_lower
     url_extension = None
 
     # Special handling for Facebook CDN URLs (fbcdn.net)
-    if "fbcdn.net" in url.lower():
+    if is_fbcdn:
         logger.info("📱 Detected Facebook CDN URL (fbcdn.net)")
         # For Facebook CDN URLs, look for .mp4, .mov, etc. in the path or query params
-        if ".mp4" in url.lower():
+        if ".mp4" in url_lower:
             url_extension = ".mp4"
-        elif ".mov" in url.lower():
+        elif ".mov" in url_lower:
             url_extension = ".mov"
         else:
             # Default to .mp4 for Facebook videos if extension not found
             url_extension = ".mp4"
-        logger.info(f"📄 Using file extension for Facebook CDN video: {url_extension}")
+        logger.info("📄 Using file extension for Facebook CDN video: %s", url_extension)
     else:
         # Try to guess the file type from the URL for non-FB CDN URLs
-        video_extensions = [
-            ".mp4",
-            ".mov",
-            ".avi",
-            ".wmv",
-            ".flv",
-            ".webm",
-            ".mkv",
-            ".m4v",
-        ]
-        for ext in video_extensions:
+        for ext in _VIDEO_EXTS:
             if url_path.endswith(ext):
                 url_extension = ext
-                logger.info(f"📄 Detected video file extension from URL: {ext}")
-            break
+                logger.info("📄 Detected video file extension from URL: %s", ext)
+                break
 
     # If extension not found in path, look in query parameters too (common for some hosts)
     if not url_extension and parsed_url.query:
@@ -70,57 +250,42 @@ def download_video_from_url(url: str) -> str:
         for param_name in ["file", "filename", "name", "video"]:
             if param_name in query_params:
                 param_value = query_params[param_name][0].lower()
-                for ext in video_extensions:
+                for ext in _VIDEO_EXTS:
                     if param_value.endswith(ext):
                         url_extension = ext
                         logger.info(
-                            f"📄 Detected video file extension from query parameter: {ext}"
+                            "📄 Detected video file extension from query parameter: %s",
+                            ext,
                         )
                         break
                 if url_extension:
                     break
 
     # Special handling for Google Drive links
-    if "drive.google.com" in url or "docs.google.com" in url:
-        logger.info(f"🔄 Using specialized Google Drive video download handler")
+    if "drive.google.com" in url_lower or "docs.google.com" in url_lower:
+        logger.info("🔄 Using specialized Google Drive video download handler")
         return download_google_drive_video(url)
 
     # Special handling for cloud storage services
-    if "storage.googleapis.com" in url:
-        logger.info(f"📦 Detected Google Cloud Storage URL: {url}")
-    elif "cloudfront.net" in url:
-        logger.info(f"📦 Detected Amazon CloudFront URL: {url}")
-    elif "amazonaws.com" in url and "s3" in url:
-        logger.info(f"📦 Detected Amazon S3 URL: {url}")
-    elif "blob.core.windows.net" in url:
-        logger.info(f"📦 Detected Azure Blob Storage URL: {url}")
-
-    if any(
-        host in url
-        for host in [
-            "storage.googleapis.com",
-            "cloudfront.net",
-            "amazonaws.com",
-            "blob.core.windows.net",
-        ]
-    ):
-        logger.info(f"☁️ Using direct download for cloud storage URL")
+    cloud_label = next(
+        (label for host, label in _CLOUD_HOSTS if host in url_lower), None
+    )
+    if cloud_label:
+        logger.info("📦 Detected %s URL: %s", cloud_label, url)
+        logger.info("☁️ Using direct download for cloud storage URL")
 
     # Generate a filename based on the URL
-    parsed_url = urlparse(url)
-
     # For Facebook CDN URLs with complex parameters, create a filename from hash of URL
-    if "fbcdn.net" in url or len(url) > 200:
+    if is_fbcdn or len(url) > 200:
         # Extract any identifiable number from the URL for Facebook videos
-        id_match = re.search(r"\/(\d+)_", url)
-        id_part = (
-            f"fb_{id_match.group(1)}"
-            if id_match
-            else f"fb_{hashlib.md5(url.encode()).hexdigest()[:8]}"
-        )
+        id_match = _FB_ID_RE.search(url)
+        if id_match:
+            id_part = f"fb_{id_match.group(1)}"
+        else:
+            id_part = f"fb_{hashlib.blake2b(url.encode(), digest_size=4).hexdigest()}"
         # Always use .mp4 for Facebook videos as it's their default format
         filename = f"{id_part}.mp4"
-        logger.info(f"🎬 Created filename for Facebook CDN video: {filename}")
+        logger.info("🎬 Created filename for Facebook CDN video: %s", filename)
     else:
         # For normal URLs, get filename from path
         filename = os.path.basename(parsed_url.path)
@@ -134,6 +299,8 @@ def download_video_from_url(url: str) -> str:
         suffix = ".mp4"
 
     fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    # Each attempt reopens (and truncates) the file by path
+    os.close(fd)
 
     # Setting up improved timeouts and retry handling
     max_retries = 3
@@ -157,12 +324,15 @@ def download_video_from_url(url: str) -> str:
             }
 
             logger.info(
-                f"Download attempt {retry_count + 1}/{max_retries} (timeout: {timeout}s)"
+                "Download attempt %s/%s (timeout: %ss)",
+                retry_count + 1,
+                max_retries,
+                timeout,
             )
 
             # Special handling for Facebook CDN URLs
-            if "fbcdn.net" in url:
-                logger.info(f"🔍 Using specialized handling for Facebook CDN URL")
+            if is_fbcdn:
+                logger.info("🔍 Using specialized handling for Facebook CDN URL")
                 # For Facebook CDN URLs, we may need to try multiple variants
                 fetch_url = url
             else:
@@ -170,19 +340,19 @@ def download_video_from_url(url: str) -> str:
 
             # Download the video with proper headers
             try:
-                response = requests.get(
+                response = _SESSION.get(
                     fetch_url, stream=True, timeout=timeout, headers=headers
                 )
                 response.raise_for_status()  # Raise an exception for HTTP errors
             except Exception as e:
-                if "fbcdn.net" in url and "/v/" in url:
+                if is_fbcdn and "/v/" in url:
                     # If the original URL fails, try with the modified URL
                     logger.info(
-                        f"⚠️ Original fbcdn.net URL failed, trying simplified version"
+                        "⚠️ Original fbcdn.net URL failed, trying simplified version"
                     )
                     parts = url.split("/v/")
                     modified_url = parts[0] + "/" + parts[1].split("/", 1)[1]
-                    response = requests.get(
+                    response = _SESSION.get(
                         modified_url, stream=True, timeout=timeout, headers=headers
                     )
                     response.raise_for_status()
@@ -191,41 +361,54 @@ def download_video_from_url(url: str) -> str:
                     raise e
 
             # Write the video to the temp file
-            total_size = 0
-            with os.fdopen(fd, "wb") as temp_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        temp_file.write(chunk)
-                        total_size += len(chunk)
+            with open(temp_path, "wb", buffering=0) as temp_file:
+                total_size = _write_response_body(response, temp_file)
 
             # Verify we got actual content
             if total_size == 0:
-                raise RuntimeError("Downloaded file is empty")
+                raise _EmptyDownloadError("Downloaded file is empty")
 
             logger.info(
-                f"✅ Video downloaded successfully ({total_size} bytes) to: {temp_path}"
+                "✅ Video downloaded successfully (%s bytes) to: %s",
+                total_size,
+                temp_path,
             )
             download_success = True
             return temp_path
 
         except Exception as e:
             last_error = str(e)
-            logger.warning(f"Download attempt {retry_count + 1} failed: {last_error}")
+            logger.warning(
+                "Download attempt %s failed: %s", retry_count + 1, last_error
+            )
             retry_count += 1
 
-            # Wait before retrying
+            # Fail fast on permanent errors, back off before retrying the rest
+            delay = _retry_delay(e, retry_count)
+            if delay is None:
+                logger.error(
+                    "❌ Failed to download video from URL %s: %s", url, last_error
+                )
+                _remove_partial_download(temp_path)
+                raise RuntimeError(f"Failed to download video: {last_error}") from e
             if retry_count < max_retries:
-                time.sleep(3)  # Slightly longer wait for videos
+                logger.info("⏳ Retrying download in %.1fs", delay)
+                time.sleep(delay)
 
     # If we got here, all attempts failed
     logger.error(
-        f"❌ Failed to download video from URL {url} after {max_retries} attempts: {last_error}"
+        "❌ Failed to download video from URL %s after %s attempts: %s",
+        url,
+        max_retries,
+        last_error,
     )
+    _remove_partial_download(temp_path)
     raise RuntimeError(
         f"Failed to download video after {max_retries} attempts: {last_error}"
     )
 
 
+@functools.lru_cache(maxsize=256)
 def extract_google_drive_video_id(url: str) -> Optional[str]:
     """
     Extract the file ID from a Google Drive URL specifically for videos.
@@ -241,9 +424,8 @@ def extract_google_drive_video_id(url: str) -> Optional[str]:
         return None
 
     # Check for Google Drive domains
-    if not any(
-        domain in url.lower() for domain in ["drive.google.com", "docs.google.com"]
-    ):
+    url_lower = url.lower()
+    if "drive.google.com" not in url_lower and "docs.google.com" not in url_lower:
         return None
 
     # Format: https://drive.google.com/file/d/FILE_ID/view
@@ -251,11 +433,11 @@ def extract_google_drive_video_id(url: str) -> Optional[str]:
         try:
             file_id = url.split("/file/d/")[1].split("/")[0]
             logger.info(
-                f"📋 Extracted Google Drive file ID from file/d/ format: {file_id}"
+                "📋 Extracted Google Drive file ID from file/d/ format: %s", file_id
             )
             return file_id
         except Exception as e:
-            logger.warning(f"⚠️ Failed to extract ID from file/d/ format: {str(e)}")
+            logger.warning("⚠️ Failed to extract ID from file/d/ format: %s", e)
             pass
 
     parsed_url = urlparse(url)
@@ -265,7 +447,7 @@ def extract_google_drive_video_id(url: str) -> Optional[str]:
     if "id" in query_params:
         file_id = query_params["id"][0]
         logger.info(
-            f"📋 Extracted Google Drive file ID from query parameter id: {file_id}"
+            "📋 Extracted Google Drive file ID from query parameter id: %s", file_id
         )
         return file_id
 
@@ -273,27 +455,26 @@ def extract_google_drive_video_id(url: str) -> Optional[str]:
     if parsed_url.path == "/uc" and "id" in query_params:
         file_id = query_params["id"][0]
         logger.info(
-            f"📋 Extracted Google Drive file ID from uc path with id: {file_id}"
+            "📋 Extracted Google Drive file ID from uc path with id: %s", file_id
         )
         return file_id
 
     # Format: https://docs.google.com/document/d/FILE_ID/edit
     # Format: https://docs.google.com/spreadsheets/d/FILE_ID/edit
     # Format: https://docs.google.com/presentation/d/FILE_ID/edit
-    docs_pattern = r"/(?:document|spreadsheets|presentation)/d/([a-zA-Z0-9_-]+)"
-    docs_match = re.search(docs_pattern, url)
+    docs_match = _DRIVE_DOCS_RE.search(url)
     if docs_match:
         file_id = docs_match.group(1)
-        logger.info(f"📋 Extracted Google Drive file ID from docs format: {file_id}")
+        logger.info("📋 Extracted Google Drive file ID from docs format: %s", file_id)
         return file_id
 
     # Format: Using a direct sharing link with a key parameter
     if "sharing" in url and "key" in query_params:
         file_id = query_params["key"][0]
-        logger.info(f"📋 Extracted Google Drive file ID from sharing key: {file_id}")
+        logger.info("📋 Extracted Google Drive file ID from sharing key: %s", file_id)
         return file_id
 
-    logger.warning(f"❌ Could not extract file ID from Google Drive URL: {url}")
+    logger.warning("❌ Could not extract file ID from Google Drive URL: %s", url)
     return None
 
 
@@ -307,7 +488,7 @@ def download_google_drive_video(url: str) -> str:
     Returns:
         Path to the downloaded video file
     """
-    logger.info(f"🎬 Downloading video from Google Drive: {url}")
+    logger.info("🎬 Downloading video from Google Drive: %s", url)
 
     # Extract the file ID
     file_id = extract_google_drive_video_id(url)
@@ -316,7 +497,7 @@ def download_google_drive_video(url: str) -> str:
 
     # Create a direct download URL
     direct_url = f"https://drive.google.com/uc?export=download&id={file_id}"
-    logger.info(f"🔄 Using direct download URL: {direct_url}")
+    logger.info("🔄 Using direct download URL: %s", direct_url)
 
     # Try to determine the file type/extension from the original URL
     file_extension = ".mp4"  # Default extension
@@ -330,88 +511,67 @@ def download_google_drive_video(url: str) -> str:
         name = query_params["name"][0]
         if "." in name:
             potential_ext = os.path.splitext(name)[1].lower()
-            video_exts = [
-                ".mp4",
-                ".mov",
-                ".avi",
-                ".wmv",
-                ".flv",
-                ".webm",
-                ".mkv",
-                ".m4v",
-            ]
-            if potential_ext in video_exts:
+            if potential_ext in _VIDEO_EXTS:
                 file_extension = potential_ext
                 logger.info(
-                    f"📄 Found video extension in query parameter: {file_extension}"
+                    "📄 Found video extension in query parameter: %s", file_extension
                 )
 
-    # Create a temporary file with the appropriate extension
-    fd, temp_path = tempfile.mkstemp(suffix=file_extension)
-
-    # Set up session for handling redirects and cookies
-    session = requests.Session()
+    temp_path = None
 
     try:
         # Initial request to get confirmation token if needed
-        logger.info(f"🌐 Making initial request to Google Drive")
-        response = session.get(direct_url, stream=True, timeout=60)
+        logger.info("🌐 Making initial request to Google Drive")
+        response = _SESSION.get(direct_url, stream=True, timeout=60)
 
         # Check if we got an error response
         if response.status_code != 200:
             logger.error(
-                f"❌ Google Drive returned status code: {response.status_code}"
+                "❌ Google Drive returned status code: %s", response.status_code
             )
             raise RuntimeError(
                 f"Failed to access Google Drive file. Status code: {response.status_code}"
             )
 
-        # Check if we need to bypass the "large file" warning
-        if "confirm=" in response.text:
-            logger.info(f"🔍 Found Google Drive confirmation prompt (large file)")
+        # Check if we need to bypass the "large file" warning. Only an HTML page
+        # can be the prompt, so a video body is never decoded as text here.
+        if _is_html_response(response) and "confirm=" in response.text:
+            logger.info("🔍 Found Google Drive confirmation prompt (large file)")
             try:
-                confirmation_token = re.search(
-                    r"confirm=([0-9a-zA-Z_-]+)", response.text
-                ).group(1)
+                confirmation_token = _DRIVE_CONFIRM_RE.search(response.text).group(1)
                 direct_url = f"{direct_url}&confirm={confirmation_token}"
-                logger.info(f"📝 Using confirmation token, updated URL")
-                response = session.get(direct_url, stream=True, timeout=120)
+                logger.info("📝 Using confirmation token, updated URL")
+                response = _SESSION.get(direct_url, stream=True, timeout=120)
             except Exception as e:
-                logger.warning(f"⚠️ Error extracting confirmation token: {str(e)}")
-                logger.info(f"🔄 Proceeding with download anyway")
+                logger.warning("⚠️ Error extracting confirmation token: %s", e)
+                logger.info("🔄 Proceeding with download anyway")
+
+        # An HTML page at this point is an error or sign-in page, not the video
+        if _is_html_response(response):
+            logger.error("❌ Google Drive returned an HTML page, not video data")
+            raise RuntimeError("Google Drive returned HTML instead of video data")
 
         # Check content type to verify it's a video
         content_type = response.headers.get("Content-Type", "")
         if content_type and "video/" in content_type:
-            logger.info(f"✅ Confirmed video content type: {content_type}")
+            logger.info("✅ Confirmed video content type: %s", content_type)
         elif content_type:
-            logger.warning(f"⚠️ Content-Type is not video: {content_type}")
+            logger.warning("⚠️ Content-Type is not video: %s", content_type)
             # Try to proceed anyway, might be application/octet-stream
 
         # Download the file
-        total_size = 0
         content_length = response.headers.get("Content-Length")
         expected_size = int(content_length) if content_length else None
 
         if expected_size:
-            logger.info(f"📊 Expected file size: {expected_size / 1024 / 1024:.2f} MB")
-
-        with os.fdopen(fd, "wb") as temp_file:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    temp_file.write(chunk)
-                    total_size += len(chunk)
-
-                    # Log progress for large files
-                    if (
-                        expected_size
-                        and expected_size > 10 * 1024 * 1024
-                        and total_size % (5 * 1024 * 1024) < 8192
-                    ):
-                        progress = (total_size / expected_size) * 100
-                        logger.info(
-                            f"📈 Download progress: {progress:.1f}% ({total_size / 1024 / 1024:.2f} MB)"
-                        )
+            logger.info("📊 Expected file size: %.2f MB", expected_size / 1024 / 1024)
+
+        # Create a temporary file with the appropriate extension
+        fd, temp_path = tempfile.mkstemp(suffix=file_extension)
+        with os.fdopen(fd, "wb", buffering=0) as temp_file:
+            total_size = _write_response_body(
+                response, temp_file, expected_size, reject_html=True
+            )
 
         # Verify we got actual content
         if total_size == 0:
@@ -420,33 +580,25 @@ def download_google_drive_video(url: str) -> str:
         # If file is very small, it might be an error page rather than the actual video
         if total_size < 10000:  # Less than 10 KB is suspicious for a video
             logger.warning(
-                f"⚠️ Downloaded file is suspiciously small: {total_size} bytes"
+                "⚠️ Downloaded file is suspiciously small: %s bytes", total_size
             )
-            # Read start of file to check if it's HTML error page
-            with open(temp_path, "rb") as f:
-                start_bytes = f.read(100)
-                if b"<!DOCTYPE html>" in start_bytes or b"<html" in start_bytes:
-                    logger.error(
-                        f"❌ Downloaded file appears to be HTML, not video data"
-                    )
-                    raise RuntimeError(
-                        "Google Drive returned HTML instead of video data"
-                    )
 
         logger.info(
-            f"✅ Google Drive video downloaded successfully ({total_size / 1024 / 1024:.2f} MB) to: {temp_path}"
+            "✅ Google Drive video downloaded successfully (%.2f MB) to: %s",
+            total_size / 1024 / 1024,
+            temp_path,
         )
         return temp_path
 
     except Exception as e:
         # Clean up temp file if something went wrong
-        if os.path.exists(temp_path):
+        if temp_path and os.path.exists(temp_path):
             try:
                 os.remove(temp_path)
-                logger.info(f"🧹 Removed incomplete download file: {temp_path}")
+                logger.info("🧹 Removed incomplete download file: %s", temp_path)
             except:
                 pass
-        logger.error(f"❌ Error downloading Google Drive video: {str(e)}")
+        logger.error("❌ Error downloading Google Drive video: %s", e)
         raise RuntimeError(f"Error downloading Google Drive video: {str(e)}")
 
 
@@ -461,29 +613,26 @@ def get_video_info(file_path: str) -> Tuple[int, int, int]:
         Tuple containing (file_size_bytes, duration_seconds, width_pixels, height_pixels)
     """
     try:
-        file_size = os.path.getsize(file_path)
-
-        # Check if file is actually a video by examining headers
-        with open(file_path, "rb") as f:
-            header = f.read(12)  # Read first 12 bytes to check file signature
-
-        # Check common video file signatures
-        is_video = (
-            header.startswith(b"\x00\x00\x00\x18ftypmp42")  # MP4
-            or header.startswith(b"\x00\x00\x00\x1cftypisom")  # MP4 ISO format
-            or header.startswith(b"\x00\x00\x00\x20ftyp")  # Common MP4 format
-            or header.startswith(b"\x52\x49\x46\x46")  # AVI
-            or header.startswith(b"\x1a\x45\xdf\xa3")  # WebM/MKV
-        )
+        # Size and file signature from one unbuffered open
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            file_size = os.fstat(fd).st_size
+            header = os.read(fd, 12)
+        finally:
+            os.close(fd)
+
+        # Check common video file signatures: every MP4/MOV (ISO base media)
+        # file has "ftyp" at offset 4, AVI starts with RIFF and WebM/MKV with EBML
+        is_video = header[4:8] == b"ftyp" or header[:4] in _VIDEO_MAGIC
 
         if not is_video:
             logger.warning(
-                f"⚠️ File doesn't appear to be a standard video format: {file_path}"
+                "⚠️ File doesn't appear to be a standard video format: %s", file_path
             )
 
         # Log file size in MB for clarity
         size_mb = file_size / (1024 * 1024)
-        logger.info(f"📊 Video file size: {size_mb:.2f} MB")
+        logger.info("📊 Video file size: %.2f MB", size_mb)
 
         # Duration and dimensions would require a video processing library like ffmpeg
         # In a production environment, consider adding actual video metadata extraction
@@ -491,5 +640,5 @@ def get_video_info(file_path: str) -> Tuple[int, int, int]:
 
         return file_size, 0, 0
     except Exception as e:
-        logger.error(f"❌ Error getting video info: {e}")
+        logger.error("❌ Error getting video info: %s", e)
         return 0, 0, 0
@@ -1,147 +1,327 @@
 #!/usr/bin/env python
 
+import io
 import os
 import tempfile
 import subprocess
 import logging
 import hashlib
+import shutil
+import functools
+import importlib.util
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Extracted frames are scaled down (keeping their aspect ratio) to fit within
+# this size; Facebook doesn't need a full-resolution 4K frame as a thumbnail
+THUMBNAIL_MAX_SIZE = 1280
 
-def extract_video_thumbnail(video_path):
+# Image format of generated thumbnails: "jpeg", or "webp" for files 25-35%
+# smaller at the same visual quality. JPEG stays the default until WebP ad images
+# are confirmed for the Graph API version in use.
+THUMBNAIL_FORMAT = "jpeg"
+
+# File suffix for each supported thumbnail format
+_FORMAT_SUFFIXES = {"jpeg": ".jpg", "webp": ".webp"}
+
+# Backends available for extracting frames, checked once at import instead of
+# on every call (a missing ffmpeg would otherwise cost a failed process spawn,
+# a missing module a failed import)
+_HAS_CV2 = importlib.util.find_spec("cv2") is not None
+_HAS_AV = importlib.util.find_spec("av") is not None
+_HAS_PIL = importlib.util.find_spec("PIL") is not None
+_FFMPEG = shutil.which("ffmpeg")
+
+# System fonts that are likely to be available for placeholder text
+_SYSTEM_FONTS = (
+    "/System/Library/Fonts/Helvetica.ttc",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+    "C:\\Windows\\Fonts\\arial.ttf",  # Windows
+)
+
+
+def _write_thumbnail(data, fmt="jpeg"):
+    """Write thumbnail data to a new temporary file and return its path."""
+    fd, thumbnail_path = tempfile.mkstemp(suffix=_FORMAT_SUFFIXES[fmt])
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return thumbnail_path
+
+
+def _encode_image(image, fmt):
+    """
+    Encode a PIL image in the given thumbnail format and return the bytes.
+
+    JPEGs use optimized Huffman tables, progressive encoding and 4:2:0 chroma
+    subsampling, which make the file noticeably smaller than a baseline quality
+    95 JPEG without a visible difference on a video frame. WebP uses method 4,
+    the usual trade-off between encoding speed and size.
+    """
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=85, method=4)
+    else:
+        image.save(
+            buffer, "JPEG", quality=90, optimize=True, progressive=True, subsampling=2
+        )
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=1)
+def _find_system_font():
+    """Return the path of the first system font that exists, or None."""
+    for font_path in _SYSTEM_FONTS:
+        if os.path.exists(font_path):
+            return font_path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_font(size):
+    """
+    Return the system font at the given size, or None to use the default font.
+
+    Loaded once per size, so placeholders don't re-parse the font file every
+    time; the font paths themselves are only checked once per process.
+    """
+    from PIL import ImageFont
+
+    font_path = _find_system_font()
+    if not font_path:
+        return None
+    try:
+        return ImageFont.truetype(font_path, size)
+    except Exception:
+        # If loading the font fails, use the default
+        return None
+
+
+def extract_video_thumbnail(video_path, fmt=None):
     """
     Extract the first frame of a video to use as a thumbnail.
+    See extract_video_thumbnail_bytes for how the frame is extracted.
+
+    Args:
+        video_path: Path to the video file
+        fmt: Image format, "jpeg" or "webp" (defaults to THUMBNAIL_FORMAT)
+
+    Returns:
+        Path to the generated thumbnail image or None if extraction failed
+
+    Raises:
+        ValueError: If fmt is not a supported format
+    """
+    fmt = fmt or THUMBNAIL_FORMAT
+    data = extract_video_thumbnail_bytes(video_path, fmt)
+    if not data:
+        return None
+    thumbnail_path = _write_thumbnail(data, fmt)
+    logger.info(f"💾 Saved thumbnail to: {thumbnail_path}")
+    return thumbnail_path
+
+
+def extract_video_thumbnail_bytes(video_path, fmt=None):
+    """
+    Extract the first frame of a video as image data, without writing a file.
+    Useful for callers that upload the thumbnail straight away.
     Uses multiple methods:
     1. OpenCV (if available)
-    2. ffmpeg (if available)
-    3. PIL fallback (generates a placeholder)
+    2. PyAV (if available), which decodes in-process with the ffmpeg libraries
+    3. ffmpeg command line (if available)
+    4. PIL fallback (generates a placeholder)
 
     Args:
         video_path: Path to the video file
+        fmt: Image format, "jpeg" or "webp" (defaults to THUMBNAIL_FORMAT)
 
     Returns:
-        Path to the generated thumbnail image or None if extraction failed
+        The encoded thumbnail or None if extraction failed
+
+    Raises:
+        ValueError: If fmt is not a supported format
     """
-    # Create a temporary file for the thumbnail
-    fd, thumbnail_path = tempfile.mkstemp(suffix=".jpg")
-    os.close(fd)  # Close the file descriptor as we'll use the path
+    fmt = fmt or THUMBNAIL_FORMAT
+    if fmt not in _FORMAT_SUFFIXES:
+        raise ValueError(f"Unsupported thumbnail format: {fmt}")
 
     logger.info(f"🖼️ Extracting thumbnail from video: {video_path}")
 
     # Method 1: Try using OpenCV if available - best for first frame extraction
-    try:
-        import cv2
+    if not _HAS_CV2:
+        logger.warning("⚠️ OpenCV (cv2) not available, trying PyAV instead")
+    else:
+        try:
+            import cv2
 
-        # Open the video file
-        vidcap = cv2.VideoCapture(video_path)
+            # Open the video file
+            vidcap = cv2.VideoCapture(video_path)
 
-        # Check if video opened successfully
-        if not vidcap.isOpened():
-            logger.error(f"❌ OpenCV couldn't open the video file: {video_path}")
-            # Will fall through to next method
-        else:
-            # Read the first frame
-            success, image = vidcap.read()
-
-            if success:
-                # Save the first frame as a JPEG
-                cv2.imwrite(thumbnail_path, image, [cv2.IMWRITE_JPEG_QUALITY, 95])
-                vidcap.release()
-
-                # Check if the thumbnail was created and has contents
-                if (
-                    os.path.exists(thumbnail_path)
-                    and os.path.getsize(thumbnail_path) > 0
-                ):
-                    logger.info(
-                        f"✅ Successfully extracted first frame with OpenCV: {thumbnail_path}"
-                    )
-                    return thumbnail_path
+            # Check if video opened successfully
+            if not vidcap.isOpened():
+                logger.error(f"❌ OpenCV couldn't open the video file: {video_path}")
+                # Will fall through to next method
             else:
-                logger.error("❌ Failed to read the first frame from video")
-                vidcap.release()
-                # Will fall through to the next method
-    except ImportError:
-        logger.warning("⚠️ OpenCV (cv2) not available, trying ffmpeg instead")
-        # Will fall through to the next method
-    except Exception as e:
-        logger.error(f"❌ Error extracting thumbnail with OpenCV: {e}")
-        # Will fall through to the next method
+                # Grab the first frame and decode only that one, without buffering
+                # frames ahead of it
+                vidcap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                success = vidcap.grab()
+                if success:
+                    success, image = vidcap.retrieve()
 
-    # Method 2: Try using ffmpeg if available
-    try:
-        # Use ffmpeg to extract the first frame
-        # -y: Overwrite output file without asking
-        # -i: Input file
-        # -ss: Seek to position (0 seconds)
-        # -vframes: Number of frames to extract (1)
-        # -q:v: Quality of output image (2 is high quality, 31 is low)
-        cmd = [
-            "ffmpeg",
-            "-y",  # Overwrite output without asking
-            "-i",
-            video_path,  # Input file
-            "-ss",
-            "00:00:00",  # Position at start
-            "-vframes",
-            "1",  # Extract 1 frame
-            "-q:v",
-            "2",  # High quality
-            thumbnail_path,
-        ]
-
-        # Run the command
-        process = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-        )
+                if success:
+                    # Scale large frames down before encoding
+                    height, width = image.shape[:2]
+                    scale = THUMBNAIL_MAX_SIZE / max(width, height)
+                    if scale < 1:
+                        image = cv2.resize(
+                            image,
+                            (round(width * scale), round(height * scale)),
+                            interpolation=cv2.INTER_AREA,
+                        )
 
-        # Check if the thumbnail was created and has contents
-        if os.path.exists(thumbnail_path) and os.path.getsize(thumbnail_path) > 0:
-            logger.info(
-                f"✅ Successfully extracted thumbnail with ffmpeg: {thumbnail_path}"
-            )
-            return thumbnail_path
-        else:
-            logger.error("❌ Thumbnail was not created or is empty")
-            # Will fall through to fallback method
-    except FileNotFoundError:
-        # ffmpeg is not installed, log this clearly
+                    # Encode the first frame in memory, with the same settings
+                    # as _encode_image
+                    if fmt == "webp":
+                        extension = ".webp"
+                        params = [cv2.IMWRITE_WEBP_QUALITY, 85]
+                    else:
+                        extension = ".jpg"
+                        params = [
+                            cv2.IMWRITE_JPEG_QUALITY,
+                            90,
+                            cv2.IMWRITE_JPEG_OPTIMIZE,
+                            1,
+                            cv2.IMWRITE_JPEG_PROGRESSIVE,
+                            1,
+                        ]
+                    success, buffer = cv2.imencode(extension, image, params)
+                    vidcap.release()
+
+                    if success and buffer.size:
+                        data = buffer.tobytes()
+                        logger.info("✅ Successfully extracted first frame with OpenCV")
+                        return data
+                else:
+                    logger.error("❌ Failed to read the first frame from video")
+                    vidcap.release()
+                    # Will fall through to the next method
+        except Exception as e:
+            logger.error(f"❌ Error extracting thumbnail with OpenCV: {e}")
+            # Will fall through to the next method
+
+    # Method 2: Try PyAV if available - same decoder as ffmpeg, without
+    # starting a process
+    if not _HAS_AV:
+        logger.warning("⚠️ PyAV (av) not available, trying ffmpeg instead")
+    else:
+        try:
+            import av
+
+            with av.open(video_path) as container:
+                stream = container.streams.video[0]
+                # Only decode keyframes, the first one is all we need
+                stream.codec_context.skip_frame = "NONKEY"
+                image = next(container.decode(stream)).to_image()
+            image.thumbnail((THUMBNAIL_MAX_SIZE, THUMBNAIL_MAX_SIZE))
+            data = _encode_image(image, fmt)
+
+            if data:
+                logger.info("✅ Successfully extracted first frame with PyAV")
+                return data
+        except Exception as e:
+            logger.error(f"❌ Error extracting thumbnail with PyAV: {e}")
+
+    # Method 3: Try using ffmpeg if available
+    if _FFMPEG is None:
         logger.warning(
             "⚠️ ffmpeg not found on system, falling back to placeholder thumbnail"
         )
-        # Will fall through to fallback method
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Error running ffmpeg: {e}")
-        if hasattr(e, "stderr") and e.stderr:
-            logger.error(f"ffmpeg stderr: {e.stderr.decode('utf-8')}")
-        # Will fall through to fallback method
-    except Exception as e:
-        logger.error(f"❌ Error extracting thumbnail with ffmpeg: {e}")
-        # Will fall through to fallback method
+    else:
+        try:
+            # Use ffmpeg to extract the first frame
+            # -hide_banner -loglevel error: Only write errors to stderr, so
+            #      nothing but a failure's cause is captured
+            # -y: Overwrite output file without asking
+            # -ss: Seek to position (0 seconds); placed before -i it seeks the input
+            #      to the nearest keyframe instead of decoding up to the position
+            # -skip_frame nokey: Only decode keyframes
+            # -i: Input file
+            # -an / -sn / -dn: Ignore audio, subtitle and data streams
+            # -vframes: Number of frames to extract (1)
+            # -q:v: Quality of output JPEG (2 is high quality, 31 is low)
+            # -f image2pipe -vcodec mjpeg pipe:1: Write the JPEG to stdout
+            #      (-vcodec libwebp -quality 85 -f webp for WebP)
+            if fmt == "webp":
+                output_args = ["-vcodec", "libwebp", "-quality", "85", "-f", "webp"]
+            else:
+                output_args = ["-q:v", "2", "-f", "image2pipe", "-vcodec", "mjpeg"]
+            cmd = [
+                _FFMPEG,
+                "-hide_banner",
+                "-loglevel",
+                "error",  # Quiet unless something goes wrong
+                "-y",  # Overwrite output without asking
+                "-ss",
+                "00:00:00",  # Position at start
+                "-skip_frame",
+                "nokey",  # Keyframes only
+                "-i",
+                video_path,  # Input file
+                "-an",
+                "-sn",
+                "-dn",
+                "-vframes",
+                "1",  # Extract 1 frame
+                *output_args,
+                "pipe:1",
+            ]
+
+            # Run the command
+            process = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
+
+            # Check that ffmpeg produced the thumbnail
+            if process.stdout:
+                logger.info("✅ Successfully extracted thumbnail with ffmpeg")
+                return process.stdout
+            else:
+                logger.error("❌ Thumbnail was not created or is empty")
+                # Will fall through to fallback method
+        except subprocess.CalledProcessError as e:
+            logger.error(f"❌ Error running ffmpeg: {e}")
+            if hasattr(e, "stderr") and e.stderr:
+                logger.error(f"ffmpeg stderr: {e.stderr.decode('utf-8')}")
+            # Will fall through to fallback method
+        except Exception as e:
+            logger.error(f"❌ Error extracting thumbnail with ffmpeg: {e}")
+            # Will fall through to fallback method
 
     # Fallback method: Create a placeholder thumbnail using PIL
+    if not _HAS_PIL:
+        logger.error("❌ Pillow (PIL) not available, cannot create a placeholder")
+        return None
     try:
-        from PIL import Image, ImageDraw, ImageFont
+        from PIL import Image, ImageDraw
 
-        # Generate RGB values from hash for a consistent color
-        video_hash = hashlib.md5(video_path.encode()).hexdigest()
-        r = int(video_hash[0:2], 16)
-        g = int(video_hash[2:4], 16)
-        b = int(video_hash[4:6], 16)
+        # Generate RGB values from a hash of the file name for a consistent color
+        r, g, b = hashlib.blake2b(
+            os.path.basename(video_path).encode(), digest_size=3
+        ).digest()
 
-        # Create a 1280x720 image (16:9 aspect ratio, standard for videos)
-        width, height = 1280, 720
+        # Create a 640x360 image (16:9 aspect ratio, standard for videos); it's
+        # only a placeholder, so it doesn't need a full HD frame
+        width, height = 640, 360
         img = Image.new("RGB", (width, height), color=(r, g, b))
         draw = ImageDraw.Draw(img)
 
         # Draw a frame
         draw.rectangle(
-            [(10, 10), (width - 10, height - 10)], outline=(255, 255, 255), width=5
+            [(5, 5), (width - 5, height - 5)], outline=(255, 255, 255), width=3
         )
 
         # Get filename without path for display
@@ -152,24 +332,8 @@ def extract_video_thumbnail(video_path):
 
         # Create a simpler text-based thumbnail since we don't know what fonts are available
         try:
-            # Try to load a font if available (but don't fail if not)
-            font = None
-            try:
-                # Try system fonts that are likely to be available
-                system_fonts = [
-                    "/System/Library/Fonts/Helvetica.ttc",  # macOS
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-                    "C:\\Windows\\Fonts\\arial.ttf",  # Windows
-                    # Add more common font paths if needed
-                ]
-
-                for font_path in system_fonts:
-                    if os.path.exists(font_path):
-                        font = ImageFont.truetype(font_path, 36)
-                        break
-            except Exception:
-                # If loading specific fonts fails, use default
-                pass
+            # Use a system font if available (the default font otherwise)
+            font = _get_font(18)
 
             # Draw the text in the center
             draw.text(
@@ -184,7 +348,7 @@ def extract_video_thumbnail(video_path):
 
             # Draw additional text explaining this is a placeholder
             draw.text(
-                (width / 2, height / 2 + 50),
+                (width / 2, height / 2 + 25),
                 "Auto-generated thumbnail",
                 fill=text_color,
                 font=font,
@@ -200,25 +364,24 @@ def extract_video_thumbnail(video_path):
 
             # Draw simple text centered approximately
             draw.text(
-                (width // 2 - 150, height // 2 - 20),
+                (width // 2 - 75, height // 2 - 10),
                 f"Video Thumbnail",
                 fill=text_color,
             )
             draw.text(
-                (width // 2 - 150, height // 2 + 20), "Auto-generated", fill=text_color
+                (width // 2 - 75, height // 2 + 10), "Auto-generated", fill=text_color
             )
 
         # Save the image
-        img.save(thumbnail_path, "JPEG", quality=95)
+        data = _encode_image(img, fmt)
 
-        if os.path.exists(thumbnail_path) and os.path.getsize(thumbnail_path) > 0:
-            logger.info(
-                f"✅ Successfully created placeholder thumbnail: {thumbnail_path}"
-            )
-            return thumbnail_path
+        if data:
+            logger.info("✅ Successfully created placeholder thumbnail")
+            return data
         else:
             logger.error("❌ Placeholder thumbnail was not created or is empty")
             return None
     except Exception as e:
         logger.error(f"❌ Error creating placeholder thumbnail: {e}")
         return None
+
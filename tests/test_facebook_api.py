@@ -9,7 +9,10 @@ import os
 import sys
 import unittest
 import tempfile
+import threading
 import logging
+from unittest import mock
+from facebook_ads_uploader import facebook_api
 from facebook_ads_uploader.facebook_api import extract_video_thumbnail
 
 # Setup logging with stdout handler
@@ -102,6 +105,39 @@ class ThumbnailExtractionTests(unittest.TestCase):
             print(f"✓ Cleaned up thumbnail: {thumbnail_path}")
 
 
+class UploadVideoThumbnailTests(unittest.TestCase):
+    """Test uploading the thumbnail alongside a video upload."""
+
+    @mock.patch.object(facebook_api, "AdAccount")
+    @mock.patch.object(
+        facebook_api, "extract_video_thumbnail_bytes", return_value=b"thumb"
+    )
+    def test_cancelled_skips_upload(self, _extract, ad_account):
+        """No image is uploaded once the video upload has failed"""
+        cancelled = threading.Event()
+        cancelled.set()
+        result = facebook_api.upload_video_thumbnail(
+            "act_1", "/tmp/video.mp4", cancelled
+        )
+        self.assertIsNone(result)
+        ad_account.return_value.create_ad_image.assert_not_called()
+
+    @mock.patch.object(facebook_api, "AdAccount")
+    @mock.patch.object(
+        facebook_api, "extract_video_thumbnail_bytes", return_value=b"thumb"
+    )
+    def test_uploads_from_memory(self, _extract, ad_account):
+        """The thumbnail bytes are uploaded base64-encoded and the hash returned"""
+        create_ad_image = ad_account.return_value.create_ad_image
+        create_ad_image.return_value = {"hash": "hash"}
+        result = facebook_api.upload_video_thumbnail(
+            "act_1", "/tmp/video.mp4", threading.Event()
+        )
+        self.assertEqual(result, "hash")
+        ad_account.assert_called_once_with("act_1")
+        create_ad_image.assert_called_once_with(params={"bytes": "dGh1bWI="})
+
+
 # Simplify running from command line
 def main():
     """Run the tests."""
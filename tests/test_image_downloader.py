@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""
+Test for the image_downloader.py module
+"""
+
+import unittest
+from unittest import mock
+
+from facebook_ads_uploader import image_downloader
+
+
+class TestImageDownloader(unittest.TestCase):
+    """Test downloading media from URLs"""
+
+    def test_unexpected_content_type_is_not_retried(self):
+        """An HTML page instead of an image fails at once and releases the response"""
+        response = mock.Mock(headers={"Content-Type": "text/html; charset=utf-8"})
+        with mock.patch.object(
+            image_downloader._SESSION, "get", return_value=response
+        ) as get, mock.patch.object(image_downloader.time, "sleep") as sleep:
+            with self.assertRaises(RuntimeError):
+                image_downloader.download_image_from_url(
+                    "https://example.com/not-an-image.jpg"
+                )
+
+        get.assert_called_once()
+        sleep.assert_not_called()
+        response.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -39,21 +39,36 @@ Run this module from the root direc        # Call the function
 
 import os
 import sys
+import tempfile
 import unittest
 import logging
 import yaml
-from unittest.mock import patch, MagicMock
-from facebook_business.adobjects.adcreative import AdCreative
-from facebook_business.adobjects.ad import Ad
+from unittest.mock import DEFAULT, patch, MagicMock
 
-# Setup logging with stdout handler
+# Use the libyaml parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# Setup logging with stdout handler; debug messages are off unless needed
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.WARNING,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler(sys.stdout)],
 )
 logger = logging.getLogger(__name__)
 
+PBIA_ID = "17841473288315687"  # Example PBIA ID for testing
+
+# Media type and URL of each creative the PBIA integration is checked for, and
+# whether the PBIA fields are expected in object_story_spec (video creatives) or
+# at the root of the creative params (image creatives)
+PBIA_MEDIA_CASES = [
+    ("image", "https://example.com/test-image.jpg", False),
+    ("video", "https://example.com/test-video.mp4", True),
+]
+
 
 class MockResponse:
     """Mock response for Facebook API calls."""
@@ -66,207 +81,162 @@ class MockResponse:
         return self.data
 
 
+class MockAdVideo(dict):
+    """Mock AdVideo holding its fields as plain dict items."""
+
+    def remote_create(self):
+        return self
+
+
+def _make_ad_account_mock():
+    """
+    Build an AdAccount mock with canned create_* responses.
+
+    Returns:
+        Tuple of the mock and a dict that receives the params passed to
+        create_ad_creative
+    """
+    ad_account = MagicMock()
+    ad_account.create_campaign.return_value = {"id": "123456789"}
+    ad_account.create_ad_set.return_value = {"id": "987654321"}
+    ad_account.create_ad.return_value = {"id": "444555666"}
+
+    # Capture the creative params
+    creative_params = {}
+
+    def create_ad_creative(params):
+        creative_params.clear()
+        creative_params.update(params)
+        return {"id": "111222333"}
+
+    ad_account.create_ad_creative.side_effect = create_ad_creative
+    return ad_account, creative_params
+
+
+# Mock environment variables
+_env_patcher = patch.dict(
+    "os.environ",
+    {
+        "FB_PBIA": PBIA_ID,
+        "FB_API_VERSION": "v22.0",
+        "FB_APP_ID": "mock_app_id",
+        "FB_APP_SECRET": "mock_app_secret",
+        "FB_ACCESS_TOKEN": "mock_access_token",
+        "FB_AD_ACCOUNT_ID": "act_12345",
+        "FB_PAGE_ID": "123456789",
+    },
+)
+
+# facebook_ads_uploader.facebook_api, imported by setUpModule
+fb_api = None
+
+
+def setUpModule():
+    """Patch the environment and import facebook_api once for the module."""
+    global fb_api
+    _env_patcher.start()
+
+    # Import after patching environment
+    import facebook_ads_uploader.facebook_api as fb_api
+
+
+def tearDownModule():
+    """Restore the environment after the last test."""
+    _env_patcher.stop()
+
+
 class PBIAIntegrationTests(unittest.TestCase):
     """Test cases for PBIA (Page-Backed Instagram Account) integration functionality."""
 
-    def setUp(self):
-        """Set up before each test."""
-        print(f"\n{'='*70}")
-        self.pbia_id = "17841473288315687"  # Example PBIA ID for testing
+    pbia_id = PBIA_ID
 
+    @classmethod
+    def setUpClass(cls):
+        """Load the test defaults once for the class."""
         # Load test defaults
         test_defaults_path = os.path.join(
             os.path.dirname(__file__), "test_defaults.yaml"
         )
         try:
             with open(test_defaults_path, "r") as f:
-                self.test_defaults = yaml.safe_load(f)
-            print(f"Loaded test defaults from {test_defaults_path}")
+                cls.test_defaults = yaml.load(f, Loader=YamlLoader)
+            logger.debug("Loaded test defaults from %s", test_defaults_path)
         except Exception as e:
-            print(f"Warning: Could not load test defaults: {e}")
-            self.test_defaults = {
+            logger.warning("Could not load test defaults: %s", e)
+            cls.test_defaults = {
+                "landing_page_prefix": "https://example.com/",
                 "landing_page": {"prefix": "https://example.com/", "utm_params": True},
                 "ad": {},
                 "adset": {},
                 "campaign": {},
             }
 
-        # Mock environment variables
-        self.env_patcher = patch.dict(
-            "os.environ",
-            {
-                "FB_PBIA": self.pbia_id,
-                "FB_APP_ID": "mock_app_id",
-                "FB_APP_SECRET": "mock_app_secret",
-                "FB_ACCESS_TOKEN": "mock_access_token",
-                "FB_AD_ACCOUNT_ID": "act_12345",
-                "FB_PAGE_ID": "123456789",
-            },
-        )
-        self.env_patcher.start()
-
-        # Import after patching environment
-        from facebook_ads_uploader.facebook_api import upload_campaign
-
-        self.upload_campaign = upload_campaign
-
-    def tearDown(self):
-        """Clean up after each test."""
-        self.env_patcher.stop()
-
-    @patch("facebook_ads_uploader.facebook_api.FacebookAdsApi")
-    @patch("facebook_ads_uploader.facebook_api.AdAccount")
-    def test_image_creative_pbia_integration(self, mock_ad_account, mock_fb_api):
-        """Test that PBIA is correctly applied to image creatives."""
-        print("\nTEST: Image Creative PBIA Integration")
-        print("------------------------------------")
-
-        # Mock the Facebook API responses
-        mock_ad_account_instance = MagicMock()
-        mock_ad_account.return_value = mock_ad_account_instance
-
-        # Mock the campaign creation
-        mock_campaign = {"id": "123456789"}
-        mock_ad_account_instance.create_campaign.return_value = mock_campaign
-
-        # Mock the ad set creation
-        mock_adset = {"id": "987654321"}
-        mock_ad_account_instance.create_ad_set.return_value = mock_adset
-
-        # Mock the creative creation - capture the params
-        creative_params_captured = {}
-
-        def mock_create_creative(params):
-            nonlocal creative_params_captured
-            creative_params_captured = params
-            return {"id": "111222333"}
-
-        mock_ad_account_instance.create_ad_creative.side_effect = mock_create_creative
-
-        # Mock the ad creation
-        mock_ad_account_instance.create_ad.return_value = {"id": "444555666"}
-
-        # Prepare test data - simulate a row from the spreadsheet with an image
-        row_data = {
-            "Topic": "Test Campaign",
-            "Daily Budget": "$5",
-            "Country": "US",
-            "Title": "Test Headline",
-            "Body": "Test Description",
-            "Query": "test-query",
-            "Media Path": "https://example.com/test-image.jpg",
-            "Media Type": "image",
-        }
-
-        # Call the function
-        result = self.upload_campaign(
-            ad_account_id="act_12345",
-            page_id="123456789",
-            pixel_id="987654321",
-            campaign_name="Test_Campaign_US_Image_PBIA",
-            row_data=row_data,
-            defaults={"ad": {}, "adset": {}, "campaign": {}},
-        )
-
-        # Check if the creative has the correct PBIA parameters
-        self.assertIn("object_story_spec", creative_params_captured)
-        object_story_spec = creative_params_captured.get("object_story_spec", {})
-
-        # Verify use_page_actor_override is True
-        self.assertIn("use_page_actor_override", object_story_spec)
-        self.assertTrue(object_story_spec["use_page_actor_override"])
-
-        # Verify instagram_user_id is correctly set
-        self.assertIn("instagram_user_id", object_story_spec)
-        self.assertEqual(object_story_spec["instagram_user_id"], self.pbia_id)
-
-        print(f"✅ Image creative correctly configured with PBIA ID: {self.pbia_id}")
-        print(
-            f"✅ use_page_actor_override correctly set to: {object_story_spec['use_page_actor_override']}"
-        )
-
-    @patch("facebook_ads_uploader.facebook_api.FacebookAdsApi")
-    @patch("facebook_ads_uploader.facebook_api.AdAccount")
-    @patch("facebook_ads_uploader.facebook_api.download_video_from_url")
-    @patch("facebook_ads_uploader.facebook_api.AdVideo")
-    def test_video_creative_pbia_integration(
-        self, mock_video, mock_download, mock_ad_account, mock_fb_api
-    ):
-        """Test that PBIA is correctly applied to video creatives."""
-        print("\nTEST: Video Creative PBIA Integration")
-        print("------------------------------------")
-
-        # Mock the download video function
-        mock_download.return_value = "/tmp/test-video.mp4"
+    @patch.multiple(
+        "facebook_ads_uploader.facebook_api",
+        FacebookAdsApi=DEFAULT,
+        AdAccount=DEFAULT,
+        download_video_from_url=DEFAULT,
+        AdVideo=DEFAULT,
+    )
+    def test_creative_pbia_integration(self, **mocks):
+        """Test that PBIA is correctly applied to image and video creatives."""
+        # Mock the download video function with a non-empty local file
+        fd, video_path = tempfile.mkstemp(suffix=".mp4")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"not really a video")
+        self.addCleanup(lambda: os.path.exists(video_path) and os.remove(video_path))
+        mocks["download_video_from_url"].return_value = video_path
 
         # Mock the video upload
-        mock_video_instance = MagicMock()
-        mock_video_instance.__getitem__.return_value = "777888999"  # video ID
-        mock_video.return_value = mock_video_instance
-
-        # Mock the Facebook API responses
-        mock_ad_account_instance = MagicMock()
-        mock_ad_account.return_value = mock_ad_account_instance
-
-        # Mock the campaign creation
-        mock_campaign = {"id": "123456789"}
-        mock_ad_account_instance.create_campaign.return_value = mock_campaign
-
-        # Mock the ad set creation
-        mock_adset = {"id": "987654321"}
-        mock_ad_account_instance.create_ad_set.return_value = mock_adset
-
-        # Mock the creative creation - capture the params
-        creative_params_captured = {}
-
-        def mock_create_creative(params):
-            nonlocal creative_params_captured
-            creative_params_captured = params
-            return {"id": "111222333"}
-
-        mock_ad_account_instance.create_ad_creative.side_effect = mock_create_creative
-
-        # Mock the ad creation
-        mock_ad_account_instance.create_ad.return_value = {"id": "444555666"}
-
-        # Prepare test data - simulate a row from the spreadsheet with a video
-        row_data = {
-            "Topic": "Test Campaign",
-            "Daily Budget": "$5",
-            "Country": "US",
-            "Title": "Test Headline",
-            "Body": "Test Description",
-            "Query": "test-query",
-            "Media Path": "https://example.com/test-video.mp4",
-            "Media Type": "video",
-        }
-
-        # Call the function
-        result = self.upload_campaign(
-            ad_account_id="act_12345",
-            page_id="123456789",
-            pixel_id="987654321",
-            campaign_name="Test_Campaign_US_Video_PBIA",
-            row_data=row_data,
-            defaults={"ad": {}, "adset": {}, "campaign": {}},
-        )
-
-        # Check if the creative has the correct PBIA parameters
-        self.assertIn("object_story_spec", creative_params_captured)
-        object_story_spec = creative_params_captured.get("object_story_spec", {})
-
-        # Verify use_page_actor_override is True
-        self.assertIn("use_page_actor_override", object_story_spec)
-        self.assertTrue(object_story_spec["use_page_actor_override"])
-
-        # Verify instagram_user_id is correctly set
-        self.assertIn("instagram_user_id", object_story_spec)
-        self.assertEqual(object_story_spec["instagram_user_id"], self.pbia_id)
+        mocks["AdVideo"].Field.filepath = "filepath"
+        mocks["AdVideo"].Field.id = "id"
+        mocks["AdVideo"].return_value = MockAdVideo(id="777888999")
+
+        for media_type, media_path, in_story_spec in PBIA_MEDIA_CASES:
+            with self.subTest(media_type=media_type):
+                # Mock the Facebook API responses
+                mock_ad_account_instance, creative_params_captured = (
+                    _make_ad_account_mock()
+                )
+                mocks["AdAccount"].return_value = mock_ad_account_instance
+
+                # Prepare test data - simulate a row from the spreadsheet
+                row_data = {
+                    "Topic": "Test Campaign",
+                    "Daily Budget": "$5",
+                    "Country": "US",
+                    "Title": "Test Headline",
+                    "Body": "Test Description",
+                    "Query": "test-query",
+                    "Media Path": media_path,
+                    "Media Type": media_type,
+                }
 
-        print(f"✅ Video creative correctly configured with PBIA ID: {self.pbia_id}")
-        print(
-            f"✅ use_page_actor_override correctly set to: {object_story_spec['use_page_actor_override']}"
-        )
+                # Call the function
+                fb_api.upload_campaign(
+                    ad_account_id="act_12345",
+                    page_id="123456789",
+                    pixel_id="987654321",
+                    campaign_name=f"Test_Campaign_US_{media_type.title()}_PBIA",
+                    row_data=row_data,
+                    defaults=self.test_defaults,
+                )
+
+                # Check if the creative has the correct PBIA parameters
+                self.assertIn("object_story_spec", creative_params_captured)
+                pbia_params = creative_params_captured
+                if in_story_spec:
+                    pbia_params = creative_params_captured["object_story_spec"]
+
+                # Verify use_page_actor_override is True
+                self.assertIn("use_page_actor_override", pbia_params)
+                self.assertTrue(pbia_params["use_page_actor_override"])
+
+                # Verify instagram_user_id is correctly set
+                self.assertIn("instagram_user_id", pbia_params)
+                self.assertEqual(pbia_params["instagram_user_id"], self.pbia_id)
+
+                logger.debug("%s creative PBIA OK: %s", media_type, self.pbia_id)
 
 
 # Simplify running from command line
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+"""
+Test for the sheet.py module
+"""
+
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from facebook_ads_uploader import sheet
+
+
+class FakeSpreadsheet:
+    """Spreadsheet stand-in recording values_batch_update bodies."""
+
+    def __init__(self):
+        self.id = "spreadsheet"
+        self.value_updates = []
+        # Error raised by values_batch_update, and an event set on every call
+        self.error = None
+        self.called = threading.Event()
+
+    def values_batch_update(self, body):
+        self.called.set()
+        if self.error:
+            raise self.error
+        self.value_updates.append(body)
+
+
+class FakeWorksheet:
+    """Worksheet stand-in recording the requests made to it."""
+
+    def __init__(self, header=(), col_count=None):
+        self.header = list(header)
+        self.col_count = col_count or len(header)
+        # Errors raised by batch_update, keyed by the first range written
+        self.fail_ranges = {}
+        self.batch_updates = []
+        self.id = 0
+        self.title = "Sheet1"
+        self.spreadsheet = FakeSpreadsheet()
+
+    def row_values(self, row):
+        return list(self.header)
+
+    def add_cols(self, count):
+        self.col_count += count
+
+    def batch_update(self, data):
+        error = self.fail_ranges.get(data[0]["range"])
+        if error:
+            raise error
+        self.batch_updates.append(data)
+
+
+class TestEnsureStatusColumns(unittest.TestCase):
+    """Test locating and adding the Status and Error columns"""
+
+    def test_existing_columns(self):
+        """Existing columns are found case-insensitively without any writes"""
+        worksheet = FakeWorksheet(["Title", " status ", "ERROR"])
+        self.assertEqual(sheet.ensure_status_columns(worksheet), (2, 3))
+        self.assertEqual(worksheet.batch_updates, [])
+
+    def test_missing_columns_are_appended(self):
+        """Missing columns are appended after the header, growing the grid"""
+        worksheet = FakeWorksheet(["Title", "Body"])
+        self.assertEqual(sheet.ensure_status_columns(worksheet), (3, 4))
+        self.assertEqual(
+            worksheet.batch_updates,
+            [[{"range": "C1:D1", "values": [["Status", "Error"]]}]],
+        )
+        self.assertGreaterEqual(worksheet.col_count, 4)
+
+    def test_other_errors_do_not_reuse_columns(self):
+        """A transient failure is raised instead of renaming existing columns"""
+        worksheet = FakeWorksheet(["Title", "Body", "Query"], col_count=10)
+        worksheet.fail_ranges = {"D1:E1": Exception("APIError: [429]: Quota exceeded")}
+        with self.assertRaises(RuntimeError):
+            sheet.ensure_status_columns(worksheet)
+        self.assertEqual(worksheet.batch_updates, [])
+
+    def test_grid_limit_fallback_skips_status_column(self):
+        """The grid-limit fallback never reuses the Status column for Error"""
+        worksheet = FakeWorksheet(["Title", "Body", "Status"], col_count=10)
+        worksheet.fail_ranges = {
+            "D1:D1": Exception("Range ('Sheet1'!D1) exceeds grid limits")
+        }
+        self.assertEqual(sheet.ensure_status_columns(worksheet), (3, 2))
+        self.assertEqual(
+            worksheet.batch_updates, [[{"range": "B1", "values": [["Error"]]}]]
+        )
+
+
+class TestBuildStatusRanges(unittest.TestCase):
+    """Test turning status results into values.batchUpdate ranges"""
+
+    def test_contiguous_rows_adjacent_columns(self):
+        """Consecutive rows with adjacent columns become one rectangular range"""
+        results = [(2, "SUCCESS", ""), (3, "FAILED", "boom"), (4, "SUCCESS", "")]
+        self.assertEqual(
+            sheet._build_status_ranges(results, status_col=5, error_col=6),
+            [
+                {
+                    "range": "E2:F4",
+                    "values": [["SUCCESS", ""], ["FAILED", "boom"], ["SUCCESS", ""]],
+                }
+            ],
+        )
+
+    def test_error_column_before_status_column(self):
+        """Values follow the sheet's column order when Error comes first"""
+        results = [(2, "FAILED", "boom")]
+        self.assertEqual(
+            sheet._build_status_ranges(results, status_col=6, error_col=5),
+            [{"range": "E2:F2", "values": [["boom", "FAILED"]]}],
+        )
+
+    def test_non_contiguous_rows(self):
+        """A gap in the row indices starts a new range"""
+        results = [(7, "SUCCESS", ""), (2, "SUCCESS", ""), (3, "FAILED", "boom")]
+        self.assertEqual(
+            sheet._build_status_ranges(results, status_col=5, error_col=6),
+            [
+                {"range": "E2:F3", "values": [["SUCCESS", ""], ["FAILED", "boom"]]},
+                {"range": "E7:F7", "values": [["SUCCESS", ""]]},
+            ],
+        )
+
+    def test_non_adjacent_columns(self):
+        """Columns that aren't next to each other get one range each"""
+        results = [(2, "SUCCESS", ""), (3, "FAILED", "boom")]
+        self.assertEqual(
+            sheet._build_status_ranges(results, status_col=2, error_col=5),
+            [
+                {"range": "B2:B3", "values": [["SUCCESS"], ["FAILED"]]},
+                {"range": "E2:E3", "values": [[""], ["boom"]]},
+            ],
+        )
+
+    def test_none_values(self):
+        """None is passed through as null, and rows with no values are skipped"""
+        results = [(2, "SUCCESS", None), (3, None, None), (4, None, "boom")]
+        self.assertEqual(
+            sheet._build_status_ranges(results, status_col=5, error_col=6),
+            [
+                {"range": "E2:F2", "values": [["SUCCESS", None]]},
+                {"range": "E4:F4", "values": [[None, "boom"]]},
+            ],
+        )
+
+    def test_long_error_is_truncated(self):
+        """Error messages are cut to 1000 characters"""
+        ranges = sheet._build_status_ranges(
+            [(2, "FAILED", "x" * 5000)], status_col=5, error_col=6
+        )
+        error = ranges[0]["values"][0][1]
+        self.assertEqual(len(error), 1000)
+        self.assertTrue(error.endswith("..."))
+
+
+class TestIterStatusBatches(unittest.TestCase):
+    """Test splitting status results into request-sized batches"""
+
+    def test_row_limit(self):
+        """Batches hold at most MAX_ROWS_PER_REQUEST rows"""
+        results = [(row, "SUCCESS", "") for row in range(2, 9)]
+        with mock.patch.object(sheet, "MAX_ROWS_PER_REQUEST", 3):
+            batches = list(sheet._iter_status_batches(results))
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual([r for batch in batches for r in batch], results)
+
+    def test_cell_limit(self):
+        """Batches write at most MAX_CELLS_PER_REQUEST cells (two per row)"""
+        results = [(row, "SUCCESS", "") for row in range(2, 7)]
+        with mock.patch.object(sheet, "MAX_CELLS_PER_REQUEST", 4):
+            batches = list(sheet._iter_status_batches(results))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    def test_rows_without_values_are_skipped(self):
+        """Rows with neither a status nor an error never reach a batch"""
+        results = [(2, None, None), (3, "SUCCESS", None), (4, None, None)]
+        self.assertEqual(
+            list(sheet._iter_status_batches(results)), [[(3, "SUCCESS", None)]]
+        )
+        self.assertEqual(list(sheet._iter_status_batches([(2, None, None)])), [])
+
+
+class TestDropUnchangedValues(unittest.TestCase):
+    """Test skipping cells whose value wouldn't change"""
+
+    def test_unchanged_values_become_none(self):
+        """Values equal to the known cell value are dropped, others are kept"""
+        results = [(2, "SUCCESS", ""), (3, "FAILED", "new"), (4, "SUCCESS", "")]
+        current_values = {2: ("SUCCESS", ""), 3: ("FAILED", "old"), 4: (None, None)}
+        self.assertEqual(
+            list(sheet._drop_unchanged_values(results, current_values)),
+            [(2, None, None), (3, None, "new"), (4, "SUCCESS", "")],
+        )
+
+    def test_empty_error_clears_stale_error(self):
+        """An empty error is written over an error left by an earlier run"""
+        worksheet = FakeWorksheet()
+        sheet.update_status_rows(
+            worksheet,
+            status_col=5,
+            error_col=6,
+            results=[(2, "SUCCESS", ""), (3, "SUCCESS", "")],
+            current_values={2: ("FAILED", "boom"), 3: ("SUCCESS", "")},
+        )
+        self.assertEqual(
+            worksheet.spreadsheet.value_updates,
+            [
+                {
+                    "valueInputOption": "RAW",
+                    "data": [
+                        {"range": "'Sheet1'!E2:F2", "values": [["SUCCESS", ""]]}
+                    ],
+                }
+            ],
+        )
+
+
+class TestAsyncStatusUpdater(unittest.TestCase):
+    """Test writing status results from the background thread"""
+
+    def written_rows(self, worksheet):
+        """Return the (status, error) values written so far, in order."""
+        return [
+            tuple(values)
+            for body in worksheet.spreadsheet.value_updates
+            for value_range in body["data"]
+            for values in value_range["values"]
+        ]
+
+    def test_flush_by_size(self):
+        """A full batch is written without waiting for the flush interval"""
+        worksheet = FakeWorksheet()
+        updater = sheet.AsyncStatusUpdater(
+            worksheet, 5, 6, batch_size=2, flush_interval=60
+        )
+        updater.submit((2, "SUCCESS", ""))
+        updater.submit((3, "FAILED", "boom"))
+        self.assertTrue(worksheet.spreadsheet.called.wait(5))
+        updater.close()
+        self.assertEqual(
+            self.written_rows(worksheet), [("SUCCESS", ""), ("FAILED", "boom")]
+        )
+
+    def test_flush_by_interval(self):
+        """A partial batch is written once the flush interval has passed"""
+        worksheet = FakeWorksheet()
+        updater = sheet.AsyncStatusUpdater(
+            worksheet, 5, 6, batch_size=100, flush_interval=0.05
+        )
+        updater.submit((2, "SUCCESS", ""))
+        self.assertTrue(worksheet.spreadsheet.called.wait(5))
+        updater.close()
+        self.assertEqual(self.written_rows(worksheet), [("SUCCESS", "")])
+
+    def test_flush(self):
+        """flush() returns once everything submitted has been written"""
+        worksheet = FakeWorksheet()
+        updater = sheet.AsyncStatusUpdater(
+            worksheet, 5, 6, batch_size=100, flush_interval=60
+        )
+        updater.submit((2, "SUCCESS", ""))
+        updater.submit((4, "FAILED", "boom"))
+        updater.flush()
+        self.assertEqual(
+            self.written_rows(worksheet), [("SUCCESS", ""), ("FAILED", "boom")]
+        )
+        updater.close()
+        self.assertEqual(len(worksheet.spreadsheet.value_updates), 1)
+
+    def test_close_raises_after_failed_write(self):
+        """close() writes the remaining results and reports a failed write"""
+        worksheet = FakeWorksheet()
+        # A 403 isn't retried, so the write fails at once
+        error = Exception("The caller does not have permission")
+        error.response = SimpleNamespace(status_code=403)
+        worksheet.spreadsheet.error = error
+        updater = sheet.AsyncStatusUpdater(
+            worksheet, 5, 6, batch_size=100, flush_interval=60
+        )
+        updater.submit((2, "SUCCESS", ""))
+        with self.assertRaises(RuntimeError):
+            updater.close()
+        self.assertTrue(worksheet.spreadsheet.called.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
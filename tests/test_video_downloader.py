@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Test for the video_downloader.py module
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from facebook_ads_uploader import video_downloader
+
+
+def _response(chunks, status_code=200):
+    """Build a streamed response mock returning chunks from iter_content."""
+    response = mock.Mock(headers={}, status_code=status_code)
+    response.iter_content.return_value = iter(chunks)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    return response
+
+
+class TestDownloadVideoFromUrl(unittest.TestCase):
+    """Test downloading videos from direct URLs"""
+
+    def setUp(self):
+        # Record the temp files the download creates
+        self.temp_paths = []
+        mkstemp = tempfile.mkstemp
+
+        def record_mkstemp(*args, **kwargs):
+            fd, path = mkstemp(*args, **kwargs)
+            self.temp_paths.append(path)
+            return fd, path
+
+        patcher = mock.patch.object(
+            video_downloader.tempfile, "mkstemp", side_effect=record_mkstemp
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleep_patcher = mock.patch.object(video_downloader.time, "sleep")
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def tearDown(self):
+        for path in self.temp_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_empty_body_is_retried(self):
+        """An empty response is retried like other transient failures"""
+        responses = [_response([]), _response([b"video data"])]
+        with mock.patch.object(
+            video_downloader._SESSION, "get", side_effect=responses
+        ) as get:
+            path = video_downloader.download_video_from_url(
+                "https://example.com/video.mp4"
+            )
+
+        self.assertEqual(get.call_count, 2)
+        self.sleep.assert_called_once()
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"video data")
+
+    def test_failed_download_removes_temp_file(self):
+        """Permanent and exhausted failures both leave no temp file behind"""
+        cases = [
+            ("permanent", lambda *args, **kwargs: _response([], status_code=404)),
+            ("exhausted", lambda *args, **kwargs: _response([])),
+        ]
+        for name, get in cases:
+            with self.subTest(name), mock.patch.object(
+                video_downloader._SESSION, "get", side_effect=get
+            ):
+                with self.assertRaises(RuntimeError):
+                    video_downloader.download_video_from_url(
+                        "https://example.com/video.mp4"
+                    )
+                self.assertFalse(os.path.exists(self.temp_paths[-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ import unittest
 import os
 import tempfile
 import logging
+from unittest import mock
 
 from facebook_ads_uploader.video_thumbnail import extract_video_thumbnail
 
@@ -14,6 +15,9 @@ from facebook_ads_uploader.video_thumbnail import extract_video_thumbnail
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Contents of the fake video file; not decodable, so extraction has to fall back
+_PAYLOAD = b"This is a fake video file for testing"
+
 
 class TestVideoThumbnail(unittest.TestCase):
     """Test the video thumbnail extraction functionality"""
@@ -22,14 +26,17 @@ class TestVideoThumbnail(unittest.TestCase):
         """Create a test video file for thumbnail extraction"""
         # This is a very basic test that will use the placeholder generation
         # For a more thorough test, we'd need a real video file
-        self.test_file = tempfile.mktemp(suffix=".mp4")
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.test_file = os.path.join(temp_dir.name, "video.mp4")
         with open(self.test_file, "wb") as f:
-            f.write(b"This is a fake video file for testing")
+            f.write(_PAYLOAD)
 
-    def tearDown(self):
-        """Clean up test files"""
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        # Write extracted thumbnails to the same directory so they are removed
+        # with it
+        tempdir_patcher = mock.patch.object(tempfile, "tempdir", temp_dir.name)
+        tempdir_patcher.start()
+        self.addCleanup(tempdir_patcher.stop)
 
     def test_extract_thumbnail_fallback(self):
         """Test thumbnail extraction fallback to placeholder for invalid video"""
@@ -44,10 +51,6 @@ class TestVideoThumbnail(unittest.TestCase):
         # Verify it has content
         self.assertGreater(os.path.getsize(thumbnail_path), 0)
 
-        # Clean up the thumbnail
-        if os.path.exists(thumbnail_path):
-            os.remove(thumbnail_path)
-
 
 if __name__ == "__main__":
     unittest.main()